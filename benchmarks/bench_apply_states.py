@@ -0,0 +1,138 @@
+"""Benchmark event loop blocking while the initial list of states is applied.
+
+A synthetic get_states result is fed through apply_states of a RemoteConnection
+and the longest time the event loop was blocked is reported. It is run once
+with the whole list applied at once (behaviour before states_chunk_size was
+added) and once in chunks of the configured size.
+
+Requires Home Assistant to be installed. Run from the repository root:
+
+    python benchmarks/bench_apply_states.py --states 5000 --chunk-size 500
+"""
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.const import CONF_HOST, CONF_PORT  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.remote_homeassistant import RemoteConnection  # noqa: E402
+from custom_components.remote_homeassistant.const import (  # noqa: E402
+    CONF_STATES_CHUNK_SIZE, DEFAULT_STATES_CHUNK_SIZE)
+
+UNIQUE_ID = "0123456789abcdef0123456789abcdef"
+
+
+def synthetic_states(count):
+    """Return a get_states result with count sensors."""
+    return [
+        {
+            "entity_id": f"sensor.bench_{index}",
+            "state": str(index % 100),
+            "attributes": {
+                "friendly_name": f"Bench sensor {index}",
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "state_class": "measurement",
+            },
+            "last_changed": "2024-01-01T00:00:00+00:00",
+            "last_updated": "2024-01-01T00:00:00+00:00",
+            "context": {"id": f"{index:026d}", "parent_id": None, "user_id": None},
+        }
+        for index in range(count)
+    ]
+
+
+async def measure(config_dir, states, chunk_size):
+    """Apply states once, returns (total seconds, longest block in seconds)."""
+    hass = HomeAssistant(config_dir)
+    if hasattr(hass, "loop_thread_id"):
+        hass.loop_thread_id = threading.get_ident()
+
+    entry = SimpleNamespace(
+        entry_id="bench",
+        unique_id=UNIQUE_ID,
+        data={CONF_HOST: "remote.local", CONF_PORT: 8123},
+        options={CONF_STATES_CHUNK_SIZE: chunk_size},
+    )
+    remote = RemoteConnection(hass, entry)
+
+    handlers = {}
+
+    async def call(handler, message_type, **extra_args):
+        handlers[message_type] = handler
+
+    async def subscribe(handler, message_type, **extra_args):
+        return None
+
+    remote.call = call
+    remote.subscribe = subscribe
+    remote._connection = SimpleNamespace(closed=False)
+    # Entities are in the entity registry already, as after a reconnect
+    remote._registered_unique_ids = {
+        f"{UNIQUE_ID[:16]}_{state['entity_id']}" for state in states
+    }
+    await remote._init()
+
+    longest = 0.0
+    running = True
+
+    async def monitor():
+        nonlocal longest
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+
+    monitor_task = asyncio.create_task(monitor())
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await handlers["get_states"](
+        {"id": 1, "type": "result", "success": True, "result": states}
+    )
+    total = time.perf_counter() - start
+
+    running = False
+    await monitor_task
+    remote._remove_listener()
+    return total, longest
+
+
+async def main(args):
+    """Run benchmark and print results."""
+    states = synthetic_states(args.states)
+    with tempfile.TemporaryDirectory() as config_dir:
+        for label, chunk_size in (
+            ("single chunk", args.states),
+            (f"chunks of {args.chunk_size}", args.chunk_size),
+        ):
+            results = [
+                await measure(config_dir, states, chunk_size)
+                for _ in range(args.repeat)
+            ]
+            total = min(result[0] for result in results)
+            longest = min(result[1] for result in results)
+            print(
+                f"{label:>20}: total {total * 1000:8.2f} ms, "
+                f"longest block {longest * 1000:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--states", type=int, default=5000)
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_STATES_CHUNK_SIZE
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
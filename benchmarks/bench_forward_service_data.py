@@ -0,0 +1,106 @@
+"""Benchmark building forwarded service calls for many connections.
+
+A local call_service event with a large service_data payload is turned into
+the message sent to each remote instance, once by deep copying the event data
+(as forward_event did before) and once by shallow copying the top level and
+service_data (as async_forward_service_call does). Timings are reported with
+and without encoding the messages to JSON.
+
+    python benchmarks/bench_forward_service_data.py --connections 10
+"""
+import argparse
+import copy
+import json
+import time
+
+try:
+    from orjson import dumps
+except ImportError:
+    from json import dumps
+
+
+def large_event_data(entities, items):
+    """Return data of a call_service event with a large service_data."""
+    return {
+        "domain": "script",
+        "service": "turn_on",
+        "service_data": {
+            "entity_id": [f"light.bench_{index}" for index in range(entities)],
+            "variables": {
+                "scene": [
+                    {
+                        "entity_id": f"light.bench_{index}",
+                        "brightness": index % 255,
+                        "rgb_color": [index % 255, 128, 255 - index % 255],
+                        "transition": 2.5,
+                    }
+                    for index in range(items)
+                ],
+                "message": "x" * 1000,
+            },
+        },
+        "service_call_id": "01HBENCH00000000000000000",
+    }
+
+
+def build_deepcopy(event_data, entity_ids, _id):
+    """Return message built like forward_event did before."""
+    event_data = copy.deepcopy(event_data)
+    event_data["service_data"]["entity_id"] = list(entity_ids)
+    event_data.pop("service_call_id", None)
+    return {"id": _id, "type": "call_service", **event_data}
+
+
+def build_shallow(event_data, entity_ids, _id):
+    """Return message built like async_forward_service_call does."""
+    return {
+        "id": _id,
+        "type": "call_service",
+        "domain": event_data["domain"],
+        "service": event_data["service"],
+        "service_data": {**event_data["service_data"], "entity_id": entity_ids},
+    }
+
+
+def fan_out(build, encode, event_data, connections):
+    """Build (and encode) the message for every connection."""
+    for _id in range(connections):
+        # Every connection owns a part of the targeted entities
+        entity_ids = event_data["service_data"]["entity_id"][_id::connections]
+        message = build(event_data, entity_ids, _id)
+        if encode:
+            dumps(message)
+
+
+def best_of(repeat, func, *args):
+    """Return fastest of repeat runs of func in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(args):
+    """Run benchmark and print results."""
+    event_data = large_event_data(args.entities, args.items)
+    size = len(json.dumps(event_data))
+    print(f"service_data of {size} bytes, {args.connections} connections")
+
+    for encode in (False, True):
+        for name, build in (("deepcopy", build_deepcopy), ("shallow", build_shallow)):
+            timing = best_of(
+                args.repeat, fan_out, build, encode, event_data, args.connections
+            )
+            label = f"{name}{' + encode' if encode else ''}"
+            print(f"{label:>18}: {timing * 1000:8.3f} ms per service call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--entities", type=int, default=100)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,114 @@
+"""Micro-benchmark of the JSON codecs used for websocket messages.
+
+Frames are decoded and the decoded messages encoded again with the standard
+library, with orjson and with the helpers of Home Assistant used by
+RemoteConnection, as far as they are installed.
+
+Frames are read from a recording with one websocket text frame per line, e.g.
+copied from the websocket messages in the network tab of the browser. Without a
+recording synthetic state_changed events are used:
+
+    python benchmarks/bench_json_codec.py [--recording frames.txt]
+"""
+import argparse
+import json
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from homeassistant.helpers.json import json_dumps as ha_json_dumps
+    from homeassistant.util.json import json_loads as ha_json_loads
+except ImportError:
+    ha_json_dumps = ha_json_loads = None
+
+
+def synthetic_frames(count):
+    """Return count state_changed event frames."""
+    frames = []
+    for index in range(count):
+        entity_id = f"sensor.bench_{index % 500}"
+        state = {
+            "entity_id": entity_id,
+            "state": str(index % 100),
+            "attributes": {
+                "friendly_name": f"Bench sensor {index % 500}",
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "state_class": "measurement",
+            },
+            "last_changed": "2024-01-01T00:00:00.000000+00:00",
+            "last_updated": "2024-01-01T00:00:00.000000+00:00",
+            "context": {"id": f"{index:026d}", "parent_id": None, "user_id": None},
+        }
+        frames.append(
+            json.dumps(
+                {
+                    "id": 2,
+                    "type": "event",
+                    "event": {
+                        "event_type": "state_changed",
+                        "data": {
+                            "entity_id": entity_id,
+                            "old_state": state,
+                            "new_state": state,
+                        },
+                        "origin": "LOCAL",
+                        "time_fired": "2024-01-01T00:00:00.000000+00:00",
+                        "context": state["context"],
+                    },
+                }
+            )
+        )
+    return frames
+
+
+def codecs():
+    """Return available codecs as (name, loads, dumps)."""
+    result = [("json", json.loads, json.dumps)]
+    if orjson is not None:
+        result.append(("orjson", orjson.loads, orjson.dumps))
+    if ha_json_loads is not None:
+        result.append(("homeassistant", ha_json_loads, ha_json_dumps))
+    return result
+
+
+def best_of(repeat, func, *args):
+    """Return fastest of repeat runs of func in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(args):
+    """Run benchmark and print results."""
+    if args.recording:
+        with open(args.recording, encoding="utf-8") as file:
+            frames = [line.strip() for line in file if line.strip()]
+    else:
+        frames = synthetic_frames(args.frames)
+    messages = [json.loads(frame) for frame in frames]
+    size = sum(len(frame) for frame in frames)
+    print(f"{len(frames)} frames, {size / len(frames):.0f} bytes on average")
+
+    for name, loads, dumps in codecs():
+        decode = best_of(args.repeat, lambda: [loads(frame) for frame in frames])
+        encode = best_of(args.repeat, lambda: [dumps(msg) for msg in messages])
+        print(
+            f"{name:>14}: decode {decode / len(frames) * 1e6:7.2f} us/frame, "
+            f"encode {encode / len(frames) * 1e6:7.2f} us/frame"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording")
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -6,12 +6,12 @@ https://home-assistant.io/components/remote_homeassistant/
 """
 from __future__ import annotations
 import asyncio
+from datetime import timedelta
 from typing import Optional
-import copy
-import fnmatch
 import inspect
 import logging
-import re
+import random
+import time
 from contextlib import suppress
 
 import aiohttp
@@ -20,26 +20,30 @@ import homeassistant.components.websocket_api.auth as api
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 try:
-    from homeassistant.core_config import DATA_CUSTOMIZE
+    from homeassistant.helpers.json import json_dumps
+    from homeassistant.util.json import json_loads
 except (ModuleNotFoundError, ImportError):
-    # hass 2024.10 or older
-    from homeassistant.config import DATA_CUSTOMIZE
+    # hass 2022.5 or older, fall back to the standard library
+    from json import dumps as json_dumps, loads as json_loads
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.const import (CONF_ABOVE, CONF_ACCESS_TOKEN, CONF_BELOW,
                                  CONF_DOMAINS, CONF_ENTITIES, CONF_ENTITY_ID,
                                  CONF_EXCLUDE, CONF_HOST, CONF_INCLUDE,
                                  CONF_PORT, CONF_UNIT_OF_MEASUREMENT,
-                                 CONF_VERIFY_SSL, EVENT_CALL_SERVICE,
+                                 CONF_VERIFY_SSL,
                                  EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
-                                 SERVICE_RELOAD)
+                                 SERVICE_RELOAD, STATE_UNAVAILABLE)
 from homeassistant.core import (Context, EventOrigin, HomeAssistant, callback,
                                 split_entity_id)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.reload import async_integration_yaml_config
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
 
@@ -48,10 +52,31 @@ from custom_components.remote_homeassistant.views import DiscoveryInfoView
 from .const import (CONF_EXCLUDE_DOMAINS, CONF_EXCLUDE_ENTITIES,
                     CONF_INCLUDE_DOMAINS, CONF_INCLUDE_ENTITIES,
                     CONF_LOAD_COMPONENTS, CONF_OPTIONS, CONF_REMOTE_CONNECTION,
-                    CONF_SERVICE_PREFIX, CONF_SERVICES, CONF_UNSUB_LISTENER,
-                    DOMAIN, REMOTE_ID, DEFAULT_MAX_MSG_SIZE)
+                    CONF_SERVICE_PREFIX, CONF_SERVICES, CONF_STATES_CHUNK_SIZE,
+                    CONF_RECONNECT_GRACE_PERIOD, CONF_UNAVAILABLE_ON_DISCONNECT,
+                    CONF_SUBSCRIBE_ENTITIES, CONF_MIN_INTERVAL, CONF_DEADBAND,
+                    CONF_ATTRIBUTE_FILTER, CONF_INCLUDE_ATTRIBUTES,
+                    CONF_EXCLUDE_ATTRIBUTES, CONF_EVENT_DATA_FILTER,
+                    CONF_MAX_CONCURRENT_SERVICE_CALLS,
+                    DEFAULT_MAX_CONCURRENT_SERVICE_CALLS, SERVICE_CALL_LIMIT,
+                    CONF_RECONNECT_MAX_DELAY, DEFAULT_RECONNECT_MAX_DELAY,
+                    CONF_RESTORE_STATES, CONF_HEARTBEAT_INTERVAL,
+                    CONF_HEARTBEAT_TIMEOUT, CONF_WEBSOCKET_HEARTBEAT,
+                    DEFAULT_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_TIMEOUT,
+                    CONF_RECEIVE_QUEUE_SIZE, CONF_RECEIVE_QUEUE_OVERFLOW,
+                    DEFAULT_RECEIVE_QUEUE_SIZE, RECEIVE_QUEUE_BLOCK,
+                    RECEIVE_QUEUE_DROP_SUPERSEDED, CONF_SKIP_UNCHANGED_STATES,
+                    CONF_UNSUB_LISTENER, DOMAIN, REMOTE_ID, DEFAULT_MAX_MSG_SIZE,
+                    DEFAULT_STATES_CHUNK_SIZE, ATTR_SYNCED_ENTITIES,
+                    ATTR_TOTAL_ENTITIES)
+from .entity_filter import EntityFilter
+from .metrics import ConnectionMetrics
 from .proxy_services import ProxyServices
-from .rest_api import UnsupportedVersion, async_get_discovery_info
+from .receive_queue import ReceiveQueue
+from .service_router import async_get_router
+from .state_rewriter import StateRewriter
+from .throttle import StateThrottle
+from .rest_api import CannotConnect, UnsupportedVersion, async_get_discovery_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -109,11 +134,30 @@ INSTANCES_SCHEMA = vol.Schema(
                         vol.Optional(CONF_UNIT_OF_MEASUREMENT): cv.string,
                         vol.Optional(CONF_ABOVE): vol.Coerce(float),
                         vol.Optional(CONF_BELOW): vol.Coerce(float),
+                        vol.Optional(CONF_MIN_INTERVAL): vol.Coerce(float),
+                        vol.Optional(CONF_DEADBAND): vol.Coerce(float),
+                    }
+                )
+            ],
+        ),
+        vol.Optional(CONF_ATTRIBUTE_FILTER, default=[]): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Optional(CONF_ENTITY_ID): cv.string,
+                        vol.Optional(CONF_INCLUDE_ATTRIBUTES): vol.All(
+                            cv.ensure_list, [cv.string]
+                        ),
+                        vol.Optional(CONF_EXCLUDE_ATTRIBUTES): vol.All(
+                            cv.ensure_list, [cv.string]
+                        ),
                     }
                 )
             ],
         ),
         vol.Optional(CONF_SUBSCRIBE_EVENTS): cv.ensure_list,
+        vol.Optional(CONF_EVENT_DATA_FILTER): vol.Schema({cv.string: dict}),
         vol.Optional(CONF_ENTITY_PREFIX,
             default=DEFAULT_ENTITY_PREFIX): cv.string,
         vol.Optional(CONF_ENTITY_FRIENDLY_NAME_PREFIX,
@@ -121,6 +165,32 @@ INSTANCES_SCHEMA = vol.Schema(
         vol.Optional(CONF_LOAD_COMPONENTS): cv.ensure_list,
         vol.Required(CONF_SERVICE_PREFIX, default="remote_"): cv.string,
         vol.Optional(CONF_SERVICES): cv.ensure_list,
+        vol.Optional(CONF_STATES_CHUNK_SIZE,
+            default=DEFAULT_STATES_CHUNK_SIZE): vol.All(
+                vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_RECONNECT_GRACE_PERIOD, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_UNAVAILABLE_ON_DISCONNECT, default=False): cv.boolean,
+        vol.Optional(CONF_SUBSCRIBE_ENTITIES, default=False): cv.boolean,
+        vol.Optional(CONF_SKIP_UNCHANGED_STATES, default=False): cv.boolean,
+        vol.Optional(CONF_RECONNECT_MAX_DELAY,
+            default=DEFAULT_RECONNECT_MAX_DELAY): vol.All(
+                vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_RESTORE_STATES, default=False): cv.boolean,
+        vol.Optional(CONF_HEARTBEAT_INTERVAL, default=DEFAULT_HEARTBEAT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0.5)),
+        vol.Optional(CONF_HEARTBEAT_TIMEOUT, default=DEFAULT_HEARTBEAT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.5)),
+        vol.Optional(CONF_WEBSOCKET_HEARTBEAT, default=False): cv.boolean,
+        vol.Optional(CONF_RECEIVE_QUEUE_SIZE,
+            default=DEFAULT_RECEIVE_QUEUE_SIZE): vol.All(
+                vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_RECEIVE_QUEUE_OVERFLOW,
+            default=RECEIVE_QUEUE_BLOCK): vol.In(
+                [RECEIVE_QUEUE_BLOCK, RECEIVE_QUEUE_DROP_SUPERSEDED]),
+        vol.Optional(CONF_MAX_CONCURRENT_SERVICE_CALLS,
+            default=DEFAULT_MAX_CONCURRENT_SERVICE_CALLS): vol.All(
+                vol.Coerce(int), vol.Range(min=1)),
     }
 )
 
@@ -137,11 +207,36 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
-HEARTBEAT_INTERVAL = 20
-HEARTBEAT_TIMEOUT = 5
+# Pending requests without response are evicted after this many seconds
+REQUEST_TIMEOUT = 60
+
+# Initial delay in seconds of reconnect backoff (first retry is immediate)
+RECONNECT_BASE_DELAY = 1
+
+# Discovery info younger than this many seconds is trusted when reconnecting
+DISCOVERY_INFO_MAX_AGE = 300
+
+# Version of on-disk cache of published states and how often it is written
+STATE_CACHE_VERSION = 1
+STATE_CACHE_SAVE_INTERVAL = timedelta(minutes=5)
+
+ATTR_RESTORED = "restored"
+
+# Delay before re-subscribing to entities when new included entities appear
+RESUBSCRIBE_DELAY = 5
 
 INTERNALLY_USED_EVENTS = [EVENT_STATE_CHANGED]
 
+# Keys used by compressed states sent by subscribe_entities, see
+# homeassistant/components/websocket_api/messages.py
+COMPRESSED_STATE_ADDITIONS = "a"
+COMPRESSED_STATE_CHANGES = "c"
+COMPRESSED_STATE_REMOVALS = "r"
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_DIFF_ADDITIONS = "+"
+COMPRESSED_DIFF_REMOVALS = "-"
+
 
 def async_yaml_to_config_entry(instance_conf):
     """Convert YAML config into data and options used by a config entry."""
@@ -164,12 +259,27 @@ def async_yaml_to_config_entry(instance_conf):
 
     for option in [
         CONF_FILTER,
+        CONF_ATTRIBUTE_FILTER,
         CONF_SUBSCRIBE_EVENTS,
+        CONF_EVENT_DATA_FILTER,
         CONF_ENTITY_PREFIX,
         CONF_ENTITY_FRIENDLY_NAME_PREFIX,
         CONF_LOAD_COMPONENTS,
         CONF_SERVICE_PREFIX,
         CONF_SERVICES,
+        CONF_STATES_CHUNK_SIZE,
+        CONF_RECONNECT_GRACE_PERIOD,
+        CONF_UNAVAILABLE_ON_DISCONNECT,
+        CONF_SUBSCRIBE_ENTITIES,
+        CONF_SKIP_UNCHANGED_STATES,
+        CONF_MAX_CONCURRENT_SERVICE_CALLS,
+        CONF_RECONNECT_MAX_DELAY,
+        CONF_RESTORE_STATES,
+        CONF_HEARTBEAT_INTERVAL,
+        CONF_HEARTBEAT_TIMEOUT,
+        CONF_WEBSOCKET_HEARTBEAT,
+        CONF_RECEIVE_QUEUE_SIZE,
+        CONF_RECEIVE_QUEUE_OVERFLOW,
     ]:
         if option in conf:
             options[option] = conf.pop(option)
@@ -256,6 +366,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             CONF_UNSUB_LISTENER: entry.add_update_listener(_update_listener),
         }
 
+        if entry.options.get(CONF_RESTORE_STATES):
+            await remote.async_restore_states()
+
         async def setup_components_and_platforms():
             """Set up platforms and initiate connection."""
             for domain in entry.options.get(CONF_LOAD_COMPONENTS, []):
@@ -302,6 +415,20 @@ async def _update_listener(hass, config_entry):
     await hass.config_entries.async_reload(config_entry.entry_id)
 
 
+class _Subscription:
+    """Subscription on the remote instance shared by local handlers."""
+
+    __slots__ = ("key", "handlers", "result")
+
+    def __init__(self, key):
+        """Initialize a new _Subscription."""
+        self.key = key
+        # Id returned by subscribe -> handler
+        self.handlers = {}
+        # Response to the subscribe request, replayed to handlers joining later
+        self.result = None
+
+
 class RemoteConnection:
     """A Websocket connection to a remote home-assistant instance."""
 
@@ -313,83 +440,104 @@ class RemoteConnection:
         self._verify_ssl = config_entry.data.get(CONF_VERIFY_SSL, False)
         self._access_token = config_entry.data.get(CONF_ACCESS_TOKEN)
         self._max_msg_size = config_entry.data.get(CONF_MAX_MSG_SIZE, DEFAULT_MAX_MSG_SIZE)
+        self._states_chunk_size = config_entry.options.get(
+            CONF_STATES_CHUNK_SIZE, DEFAULT_STATES_CHUNK_SIZE)
+        self._reconnect_grace_period = config_entry.options.get(
+            CONF_RECONNECT_GRACE_PERIOD, 0)
+        self._unavailable_on_disconnect = config_entry.options.get(
+            CONF_UNAVAILABLE_ON_DISCONNECT, False)
+        self._use_subscribe_entities = config_entry.options.get(
+            CONF_SUBSCRIBE_ENTITIES, False)
+        self._skip_unchanged_states = config_entry.options.get(
+            CONF_SKIP_UNCHANGED_STATES, False)
+        self._reconnect_max_delay = config_entry.options.get(
+            CONF_RECONNECT_MAX_DELAY, DEFAULT_RECONNECT_MAX_DELAY)
+        self._info = None
+        self._info_verified_at = 0.0
+        self._heartbeat_interval = config_entry.options.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)
+        self._heartbeat_timeout = config_entry.options.get(
+            CONF_HEARTBEAT_TIMEOUT, DEFAULT_HEARTBEAT_TIMEOUT)
+        self._websocket_heartbeat = config_entry.options.get(
+            CONF_WEBSOCKET_HEARTBEAT, False)
+        self._receive_queue_size = config_entry.options.get(
+            CONF_RECEIVE_QUEUE_SIZE, DEFAULT_RECEIVE_QUEUE_SIZE)
+        self._receive_queue_overflow = config_entry.options.get(
+            CONF_RECEIVE_QUEUE_OVERFLOW, RECEIVE_QUEUE_BLOCK)
+        self._receive_queue = None
+        self._state_store = Store(
+            hass, STATE_CACHE_VERSION, f"{DOMAIN}.states.{config_entry.unique_id}"
+        )
+        self._remove_save_interval = None
 
-        # see homeassistant/components/influxdb/__init__.py
-        # for include/exclude logic
-        self._whitelist_e = set(config_entry.options.get(CONF_INCLUDE_ENTITIES, []))
-        self._whitelist_d = set(config_entry.options.get(CONF_INCLUDE_DOMAINS, []))
-        self._blacklist_e = set(config_entry.options.get(CONF_EXCLUDE_ENTITIES, []))
-        self._blacklist_d = set(config_entry.options.get(CONF_EXCLUDE_DOMAINS, []))
-
-        self._filter = [
-            {
-                CONF_ENTITY_ID: re.compile(fnmatch.translate(f.get(CONF_ENTITY_ID)))
-                if f.get(CONF_ENTITY_ID)
-                else None,
-                CONF_UNIT_OF_MEASUREMENT: f.get(CONF_UNIT_OF_MEASUREMENT),
-                CONF_ABOVE: f.get(CONF_ABOVE),
-                CONF_BELOW: f.get(CONF_BELOW),
-            }
-            for f in config_entry.options.get(CONF_FILTER, [])
-        ]
+        self._entity_filter = EntityFilter(config_entry.options)
+        self._throttle = StateThrottle(hass)
 
         self._subscribe_events = set(
             config_entry.options.get(CONF_SUBSCRIBE_EVENTS, []) + INTERNALLY_USED_EVENTS
         )
-        self._entity_prefix = config_entry.options.get(
-            CONF_ENTITY_PREFIX, "")
-        self._entity_friendly_name_prefix = config_entry.options.get(
-            CONF_ENTITY_FRIENDLY_NAME_PREFIX, "")
+        self._event_data_filter = config_entry.options.get(CONF_EVENT_DATA_FILTER, {})
+        self._rewriter = StateRewriter(
+            hass,
+            config_entry.unique_id[:16],
+            config_entry.options.get(CONF_ENTITY_PREFIX, ""),
+            config_entry.options.get(CONF_ENTITY_FRIENDLY_NAME_PREFIX, ""),
+            "%s://%s:%s" % (
+                "https" if self._secure else "http",
+                config_entry.data[CONF_HOST],
+                config_entry.data[CONF_PORT],
+            ),
+        )
 
         self._connection : Optional[ClientWebSocketResponse] = None
         self._heartbeat_task = None
         self._is_stopping = False
         self._entities = set()
+        self._remote_states = {}
+        self._entities_subscription = None
+        self._subscribed_entity_ids = set()
+        self._resubscribe_timer = None
+        self._stale_entities = set()
+        self._stale_timer = None
         self._all_entity_names = set()
+        # Set when remote entities are not enumerated, see _init
+        self._entity_names_partial = False
         self._handlers = {}
+        self._subscriptions = {}
+        self._shared_subscriptions = {}
         self._remove_listener = None
+        self._registered_unique_ids = set()
+        self.metrics = ConnectionMetrics()
         self.proxy_services = ProxyServices(hass, config_entry, self)
+        self._router = async_get_router(hass)
+        self._service_call_semaphore = asyncio.Semaphore(
+            config_entry.options.get(
+                CONF_MAX_CONCURRENT_SERVICE_CALLS,
+                DEFAULT_MAX_CONCURRENT_SERVICE_CALLS,
+            )
+        )
+        self.service_calls_pending = 0
 
         self.set_connection_state(STATE_CONNECTING)
 
         self.__id = 1
 
-    def _prefixed_entity_id(self, entity_id):
-        if self._entity_prefix:
-            domain, object_id = split_entity_id(entity_id)
-            object_id = self._entity_prefix + object_id
-            entity_id = domain + "." + object_id
-            return entity_id
-        return entity_id
-
-    def _prefixed_entity_friendly_name(self, entity_friendly_name):
-        if (self._entity_friendly_name_prefix
-            and entity_friendly_name.startswith(self._entity_friendly_name_prefix)
-            == False):
-            entity_friendly_name = (self._entity_friendly_name_prefix + 
-                                    entity_friendly_name)
-            return entity_friendly_name
-        return entity_friendly_name
-
-    def _full_picture_url(self, url):
-        if re.match(r"^https?://", url):
-            return url
-
-        baseURL = "%s://%s:%s" % (
-            "https" if self._secure else "http",
-            self._entry.data[CONF_HOST],
-            self._entry.data[CONF_PORT],
-        )
-        if url.startswith(baseURL):
-            return url
-        
-        url = baseURL + url
-        return url
- 
-    def set_connection_state(self, state):
+    @callback
+    def _async_load_registered_unique_ids(self):
+        """Fill cache of unique ids already present in entity registry."""
+        unique_id_prefix = f"{self._entry.unique_id[:16]}_"
+        entity_registry = er.async_get(self._hass)
+        self._registered_unique_ids = {
+            entry.unique_id
+            for entry in entity_registry.entities.values()
+            if entry.platform == DOMAIN
+            and entry.unique_id.startswith(unique_id_prefix)
+        }
+
+    def set_connection_state(self, state, progress=None):
         """Change current connection state."""
         signal = f"remote_homeassistant_{self._entry.unique_id}"
-        async_dispatcher_send(self._hass, signal, state)
+        async_dispatcher_send(self._hass, signal, state, progress)
 
     @callback
     def _get_url(self):
@@ -445,22 +593,44 @@ class RemoteConnection:
         session = async_get_clientsession(self._hass, self._verify_ssl)
         self.set_connection_state(STATE_CONNECTING)
 
+        attempt = 0
         while True:
-            info = await _async_instance_get_info()
-
-            # Verify we are talking to correct instance
-            if not _async_instance_id_match(info):
+            if attempt > 0:
                 self.set_connection_state(STATE_RECONNECTING)
-                await asyncio.sleep(10)
-                continue
+                await asyncio.sleep(self._reconnect_delay(attempt))
+            if self._is_stopping:
+                return
+            attempt += 1
+
+            # Discovery info is only fetched again if the instance id has not been
+            # verified recently, e.g. on a quick reconnect after a network blip
+            if (
+                self._info is not None
+                and self._hass.loop.time() - self._info_verified_at
+                < DISCOVERY_INFO_MAX_AGE
+            ):
+                info = self._info
+            else:
+                info = await _async_instance_get_info()
+
+                # Verify we are talking to correct instance
+                if not _async_instance_id_match(info):
+                    continue
+                self._info = info
+                self._info_verified_at = self._hass.loop.time()
 
             try:
                 _LOGGER.info("Connecting to %s", url)
-                self._connection = await session.ws_connect(url, max_msg_size = self._max_msg_size)
+                self._connection = await session.ws_connect(
+                    url,
+                    max_msg_size=self._max_msg_size,
+                    heartbeat=self._heartbeat_interval
+                    if self._websocket_heartbeat
+                    else None,
+                )
             except aiohttp.client_exceptions.ClientError:
-                _LOGGER.error("Could not connect to %s, retry in 10 seconds...", url)
-                self.set_connection_state(STATE_RECONNECTING)
-                await asyncio.sleep(10)
+                _LOGGER.error("Could not connect to %s, retrying...", url)
+                self._info = None
             else:
                 _LOGGER.info("Connected to home-assistant websocket at %s", url)
                 break
@@ -477,25 +647,36 @@ class RemoteConnection:
             sw_version=info.get("ha_version"),
         )
 
+        self._async_load_registered_unique_ids()
+
         asyncio.ensure_future(self._recv())
-        self._heartbeat_task = self._hass.loop.create_task(self._heartbeat_loop())
+        if not self._websocket_heartbeat:
+            self._heartbeat_task = self._hass.loop.create_task(self._heartbeat_loop())
+
+    def _reconnect_delay(self, attempt):
+        """Return delay before a reconnect attempt.
+
+        Exponential backoff with full jitter, so instances losing connection at
+        the same time do not reconnect in lock-step.
+        """
+        backoff = RECONNECT_BASE_DELAY * 2 ** min(attempt - 1, 16)
+        return random.uniform(0, min(self._reconnect_max_delay, backoff))
 
     async def _heartbeat_loop(self):
         """Send periodic heartbeats to remote instance."""
         while self._connection is not None and not self._connection.closed:
-            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await asyncio.sleep(self._heartbeat_interval)
 
             _LOGGER.debug("Sending ping")
-            event = asyncio.Event()
-
-            def resp(message):
-                _LOGGER.debug("Got pong: %s", message)
-                event.set()
-
-            await self.call(resp, "ping")
-
+            start = time.perf_counter()
             try:
-                await asyncio.wait_for(event.wait(), HEARTBEAT_TIMEOUT)
+                message = await self.async_request(
+                    "ping", timeout=self._heartbeat_timeout
+                )
+                self.metrics.heartbeat_rtt.add(time.perf_counter() - start)
+                _LOGGER.debug("Got pong: %s", message)
+            except CannotConnect:
+                break
             except asyncio.TimeoutError:
                 _LOGGER.warning("heartbeat failed")
 
@@ -503,11 +684,55 @@ class RemoteConnection:
                 asyncio.ensure_future(self._connection.close())
                 break
 
+    async def async_restore_states(self):
+        """Publish states saved during a previous run.
+
+        Restored states are marked with a restored attribute and reconciled with
+        the list of states received once connected.
+        """
+        self._remove_save_interval = async_track_time_interval(
+            self._hass, self._async_save_states, STATE_CACHE_SAVE_INTERVAL
+        )
+
+        stored = await self._state_store.async_load()
+        if not stored:
+            return
+
+        for entity_id, state in stored.items():
+            if self._hass.states.get(entity_id) is not None:
+                continue
+            self._hass.states.async_set(
+                entity_id,
+                state["state"],
+                {**state["attributes"], ATTR_RESTORED: True},
+            )
+            self._stale_entities.add(entity_id)
+        _LOGGER.debug("restored %d states", len(self._stale_entities))
+
+    async def _async_save_states(self, *_):
+        """Save currently published states to disk."""
+        states = {}
+        for entity_id in self._entities:
+            state = self._hass.states.get(entity_id)
+            if state is not None:
+                states[entity_id] = {
+                    "state": state.state,
+                    "attributes": dict(state.attributes),
+                }
+        if states:
+            await self._state_store.async_save(states)
+
     async def async_stop(self):
         """Close connection."""
         self._is_stopping = True
+        self._throttle.async_flush()
+        if self._remove_save_interval is not None:
+            self._remove_save_interval()
+            self._remove_save_interval = None
+            await self._async_save_states()
         if self._connection is not None:
             await self._connection.close()
+        self._async_remove_stale_entities()
         await self.proxy_services.unload()
 
     def _next_id(self):
@@ -515,25 +740,198 @@ class RemoteConnection:
         self.__id += 1
         return _id
 
+    async def async_get_entity_names(self):
+        """Return ids of all entities on the remote instance."""
+        if not self._entity_names_partial:
+            return set(self._all_entity_names)
+
+        # Only explicitly included entities are known, so fetch the complete
+        # list on demand (e.g. for the options flow)
+        try:
+            message = await self.async_request("get_states")
+        except (CannotConnect, asyncio.TimeoutError):
+            return set(self._all_entity_names)
+        if not message["success"]:
+            return set(self._all_entity_names)
+        return self._all_entity_names | {
+            entity["entity_id"] for entity in message["result"]
+        }
+
+    @property
+    def receive_queue_size(self):
+        """Return number of received messages waiting to be handled."""
+        if self._receive_queue is None:
+            return 0
+        return len(self._receive_queue)
+
+    @property
+    def pending_requests(self):
+        """Return number of requests waiting for a response."""
+        return len(self._handlers)
+
+    def _add_pending(self, _id, handler, timeout):
+        """Add handler waiting for response to a request."""
+        timer = self._hass.loop.call_later(timeout, self._expire_pending, _id)
+        self._handlers[_id] = (handler, timer)
+        self.metrics.max_pending_requests = max(
+            self.metrics.max_pending_requests, len(self._handlers)
+        )
+
+    def _pop_pending(self, _id):
+        """Remove and return handler waiting for response to a request."""
+        handler, timer = self._handlers.pop(_id, (None, None))
+        if timer is not None:
+            timer.cancel()
+        return handler
+
+    def _expire_pending(self, _id):
+        """Evict handler for a request that never got a response."""
+        handler, _ = self._handlers.pop(_id, (None, None))
+        if isinstance(handler, asyncio.Future):
+            if not handler.done():
+                handler.set_exception(asyncio.TimeoutError())
+        elif handler is not None:
+            _LOGGER.warning("request %d timed out, no response received", _id)
+
+    def _clear_pending(self):
+        """Drop all pending requests and subscriptions."""
+        for _id in list(self._handlers):
+            handler = self._pop_pending(_id)
+            if isinstance(handler, asyncio.Future) and not handler.done():
+                handler.set_exception(CannotConnect("Remote websocket disconnected"))
+        self._subscriptions = {}
+        self._shared_subscriptions = {}
+
+    async def _send_request(self, _id, message_type, extra_args):
+        """Send a request to the remote instance."""
+        try:
+            await self._send_json({"id": _id, "type": message_type, **extra_args})
+        except aiohttp.client_exceptions.ClientError as err:
+            _LOGGER.error("remote websocket connection closed: %s", err)
+            await self._disconnected()
+            return False
+        return True
+
+    async def _send_json(self, data):
+        """Send a message to the remote instance.
+
+        Messages are sent as text frames since the websocket API of Home Assistant
+        does not accept binary frames.
+        """
+        await self._connection.send_json(data, dumps=json_dumps)
+
     async def call(self, handler, message_type, **extra_args) -> None:
+        """Send a request, handler is called once with the response."""
         if self._connection is None:
             _LOGGER.error("No remote websocket connection")
             return
 
         _id = self._next_id()
-        self._handlers[_id] = handler
+        self._add_pending(_id, handler, REQUEST_TIMEOUT)
+        await self._send_request(_id, message_type, extra_args)
+
+    async def async_request(self, message_type, timeout=REQUEST_TIMEOUT, **extra_args):
+        """Send a request and wait for the response.
+
+        Raises asyncio.TimeoutError if no response is received in time.
+        """
+        if self._connection is None:
+            raise CannotConnect("No remote websocket connection")
+
+        _id = self._next_id()
+        future = self._hass.loop.create_future()
+        self._add_pending(_id, future, timeout)
         try:
-            await self._connection.send_json(
-                {"id": _id, "type": message_type, **extra_args}
-            )
-        except aiohttp.client_exceptions.ClientError as err:
-            _LOGGER.error("remote websocket connection closed: %s", err)
-            await self._disconnected()
+            if not await self._send_request(_id, message_type, extra_args):
+                raise CannotConnect("Remote websocket connection closed")
+            return await future
+        finally:
+            self._pop_pending(_id)
+
+    async def subscribe(self, handler, message_type, **extra_args) -> int | None:
+        """Send a request, handler is called with every related message.
+
+        Handlers subscribing with identical arguments share one subscription on
+        the remote instance, so related messages are received and decoded once.
+        Handlers must thus not modify messages. Returns an id, which can be
+        passed to unsubscribe.
+        """
+        if self._connection is None:
+            _LOGGER.error("No remote websocket connection")
+            return None
 
-    async def _disconnected(self):
-        # Remove all published entries
-        for entity in self._entities:
+        _id = self._next_id()
+        key = (message_type, repr(sorted(extra_args.items())))
+        remote_id = self._shared_subscriptions.get(key)
+        if remote_id is not None:
+            subscription = self._subscriptions[remote_id]
+            subscription.handlers[_id] = handler
+            self.metrics.subscriptions_shared += 1
+            if subscription.result is not None:
+                await self._call_handler(handler, subscription.result)
+            return _id
+
+        subscription = self._subscriptions[_id] = _Subscription(key)
+        subscription.handlers[_id] = handler
+        self._shared_subscriptions[key] = _id
+        await self._send_request(_id, message_type, extra_args)
+        return _id
+
+    async def unsubscribe(self, subscription) -> None:
+        """Cancel a subscription made with subscribe.
+
+        The subscription on the remote instance is cancelled once no handler
+        is left.
+        """
+        for remote_id, shared in self._subscriptions.items():
+            if shared.handlers.pop(subscription, None) is not None:
+                break
+        else:
+            return
+
+        if not shared.handlers:
+            del self._subscriptions[remote_id]
+            self._shared_subscriptions.pop(shared.key, None)
+            await self.call(None, "unsubscribe_events", subscription=remote_id)
+
+    @staticmethod
+    async def _call_handler(handler, message):
+        """Pass a message to a handler."""
+        if inspect.iscoroutinefunction(handler):
+            await handler(message)
+        else:
+            handler(message)
+
+    @callback
+    def _async_remove_stale_entities(self):
+        """Remove entities kept from a previous connection."""
+        if self._stale_timer is not None:
+            self._stale_timer.cancel()
+            self._stale_timer = None
+        for entity in self._stale_entities:
             self._hass.states.async_remove(entity)
+        self._stale_entities = set()
+
+    async def _disconnected(self):
+        self._throttle.async_flush()
+
+        # Published entries are kept during the grace period and reconciled
+        # with the list of states received after reconnecting
+        self._stale_entities |= self._entities
+        if self._is_stopping or not self._reconnect_grace_period:
+            self._async_remove_stale_entities()
+        elif self._stale_timer is None:
+            if self._unavailable_on_disconnect:
+                for entity in self._entities:
+                    state = self._hass.states.get(entity)
+                    if state is not None:
+                        self._hass.states.async_set(
+                            entity, STATE_UNAVAILABLE, state.attributes
+                        )
+            self._stale_timer = self._hass.loop.call_later(
+                self._reconnect_grace_period, self._async_remove_stale_entities
+            )
+
         if self._heartbeat_task is not None:
             self._heartbeat_task.cancel()
             try:
@@ -543,16 +941,40 @@ class RemoteConnection:
         if self._remove_listener is not None:
             self._remove_listener()
 
+        if self._resubscribe_timer is not None:
+            self._resubscribe_timer.cancel()
+            self._resubscribe_timer = None
+
+        self._clear_pending()
         self.set_connection_state(STATE_DISCONNECTED)
+        if not self._is_stopping:
+            self.metrics.reconnects += 1
         self._heartbeat_task = None
         self._remove_listener = None
+        for entity in self._entities:
+            self._router.async_remove_entity(entity)
         self._entities = set()
         self._all_entity_names = set()
         if not self._is_stopping:
             asyncio.ensure_future(self.async_connect())
 
     async def _recv(self):
-        while self._connection is not None and not self._connection.closed:
+        """Read messages from remote instance and queue them for dispatching.
+
+        Handlers are run by _dispatch_loop, so a slow handler (e.g. applying a
+        large list of states) does not stop reading from the socket. Responses
+        awaited with async_request, like heartbeats, are resolved right away.
+        """
+        queue = self._receive_queue = ReceiveQueue(
+            self._receive_queue_size, self._receive_queue_overflow, self.metrics
+        )
+        dispatcher = self._hass.loop.create_task(self._dispatch_loop(queue))
+
+        while (
+            self._connection is not None
+            and not self._connection.closed
+            and not dispatcher.done()
+        ):
             try:
                 data = await self._connection.receive()
             except aiohttp.client_exceptions.ClientError as err:
@@ -576,236 +998,588 @@ class RemoteConnection:
                     _LOGGER.error(f"please consider increasing message size with `{CONF_MAX_MSG_SIZE}`")
                 break
 
+            start = time.perf_counter()
             try:
-                message = data.json()
-            except TypeError as err:
+                message = data.json(loads=json_loads)
+            except (TypeError, ValueError) as err:
                 _LOGGER.error("could not decode data (%s) as json: %s", data, err)
                 break
 
             if message is None:
                 break
 
+            self.metrics.decode_time.add(time.perf_counter() - start)
+            # Payload of text frames is a str, count its size in bytes
+            payload = data.data
+            if isinstance(payload, str):
+                payload = payload.encode()
+            self.metrics.message_received(len(payload))
             _LOGGER.debug("received: %s", message)
 
-            if message["type"] == api.TYPE_AUTH_OK:
-                self.set_connection_state(STATE_CONNECTED)
-                await self._init()
+            if not self._resolve_request(message):
+                await queue.put(message)
 
-            elif message["type"] == api.TYPE_AUTH_REQUIRED:
-                if self._access_token:
-                    json_data = {"type": api.TYPE_AUTH, "access_token": self._access_token}
-                else:
-                    _LOGGER.error("Access token required, but not provided")
-                    self.set_connection_state(STATE_AUTH_REQUIRED)
-                    return
-                try:
-                    await self._connection.send_json(json_data)
-                except Exception as err:
-                    _LOGGER.error("could not send data to remote connection: %s", err)
-                    break
-
-            elif message["type"] == api.TYPE_AUTH_INVALID:
-                _LOGGER.error("Auth invalid, check your access token")
-                self.set_connection_state(STATE_AUTH_INVALID)
-                await self._connection.close()
-                return
+        # Let the dispatcher handle what was received before the connection closed
+        queue.close()
+        if await dispatcher:
+            await self._disconnected()
+
+    def _resolve_request(self, message):
+        """Pass response to a request awaited with async_request, if it is one."""
+        if message["type"] == "event" or "id" not in message:
+            return False
+        handler, _ = self._handlers.get(message["id"], (None, None))
+        if not isinstance(handler, asyncio.Future):
+            return False
+        self._pop_pending(message["id"])
+        if not handler.done():
+            handler.set_result(message)
+        return True
 
+    async def _dispatch_loop(self, queue):
+        """Handle queued messages until the queue is closed.
+
+        Returns False if the connection should not be re-established.
+        """
+        while True:
+            message = await queue.get()
+            if message is None:
+                return True
+            try:
+                if not await self._dispatch(message):
+                    return False
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("error handling message: %s", message)
+
+    async def _dispatch(self, message):
+        """Handle a message, returns False if the connection must be abandoned."""
+        if message["type"] == api.TYPE_AUTH_OK:
+            self.set_connection_state(STATE_CONNECTED)
+            await self._init()
+
+        elif message["type"] == api.TYPE_AUTH_REQUIRED:
+            if self._access_token:
+                json_data = {"type": api.TYPE_AUTH, "access_token": self._access_token}
             else:
-                handler = self._handlers.get(message["id"])
-                if handler is not None:
-                    if inspect.iscoroutinefunction(handler):
-                        await handler(message)
+                _LOGGER.error("Access token required, but not provided")
+                self.set_connection_state(STATE_AUTH_REQUIRED)
+                await self._connection.close()
+                return False
+            try:
+                await self._send_json(json_data)
+            except Exception as err:
+                _LOGGER.error("could not send data to remote connection: %s", err)
+                # Reader stops and reconnects once the connection is closed
+                await self._connection.close()
+
+        elif message["type"] == api.TYPE_AUTH_INVALID:
+            _LOGGER.error("Auth invalid, check your access token")
+            self.set_connection_state(STATE_AUTH_INVALID)
+            await self._connection.close()
+            return False
+
+        else:
+            subscription = self._subscriptions.get(message["id"])
+            if subscription is not None:
+                if message["type"] == "result":
+                    if message["success"]:
+                        subscription.result = message
                     else:
-                        handler(message)
+                        # Rejected by the remote instance (e.g. subscribe_trigger
+                        # without admin rights), so there is nothing to
+                        # unsubscribe later. Handlers may fall back to another
+                        # subscription.
+                        del self._subscriptions[message["id"]]
+                        self._shared_subscriptions.pop(subscription.key, None)
+                for handler in list(subscription.handlers.values()):
+                    await self._call_handler(handler, message)
+                return True
+
+            if message["type"] == "event":
+                return True
+
+            handler = self._pop_pending(message["id"])
+            if isinstance(handler, asyncio.Future):
+                if not handler.done():
+                    handler.set_result(message)
+            elif handler is not None:
+                await self._call_handler(handler, message)
+
+        return True
+
+    async def async_call_service(
+        self, domain, service, service_data, return_response=False
+    ):
+        """Call a service on the remote instance and wait for the result.
+
+        At most max_concurrent_service_calls calls are in flight at a time, the
+        rest are queued (service_calls_pending counts both). The deadline of
+        SERVICE_CALL_LIMIT seconds includes time spent in the queue.
+        Raises HomeAssistantError if the call failed and asyncio.TimeoutError if
+        no result was received in time.
+        """
+        extra_args = {
+            "domain": domain,
+            "service": service,
+            "service_data": service_data,
+        }
+        if return_response:
+            extra_args["return_response"] = True
+
+        # Run under wait_for, so the deadline includes waiting for a free slot
+        # (asyncio.timeout needs Python 3.11)
+        async def _async_call():
+            async with self._service_call_semaphore:
+                start = time.perf_counter()
+                message = await self.async_request("call_service", **extra_args)
+                self.metrics.service_call_latency.add(time.perf_counter() - start)
+                return message
+
+        self.service_calls_pending += 1
+        self.metrics.max_service_calls_pending = max(
+            self.metrics.max_service_calls_pending, self.service_calls_pending
+        )
+        try:
+            message = await asyncio.wait_for(_async_call(), SERVICE_CALL_LIMIT)
+        finally:
+            self.service_calls_pending -= 1
+
+        if not message["success"]:
+            raise HomeAssistantError(message["error"]["message"])
+        return message["result"]
+
+    async def async_forward_service_call(self, event, entity_ids):
+        """Forward local service call event to remote instance.
+
+        entity_ids are the ids on the remote instance of the targeted entities
+        originating from that instance. Nobody waits for forwarded calls, so
+        they are not limited by max_concurrent_service_calls and calls running
+        for a long time on the remote instance (e.g. scripts with delays) are
+        not considered failed. The result is only used for metrics and logging.
+        """
+        domain = event.data["domain"]
+        service = event.data["service"]
+        service_data = {**event.data["service_data"], "entity_id": entity_ids}
+
+        _LOGGER.debug("forward service call %s.%s: %s", domain, service, service_data)
+        self.metrics.service_calls_forwarded += 1
+        start = time.perf_counter()
+        try:
+            message = await self.async_request(
+                "call_service",
+                domain=domain,
+                service=service,
+                service_data=service_data,
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.debug(
+                "no result for forwarded service call %s.%s (yet)", domain, service
+            )
+            return
+        except HomeAssistantError as err:
+            self.metrics.service_call_failures += 1
+            _LOGGER.error(
+                "forwarded service call %s.%s failed: %s", domain, service, err
+            )
+            return
 
-        await self._disconnected()
+        self.metrics.service_call_latency.add(time.perf_counter() - start)
+        if not message["success"]:
+            self.metrics.service_call_failures += 1
+            _LOGGER.error(
+                "forwarded service call %s.%s failed: %s",
+                domain,
+                service,
+                message["error"]["message"],
+            )
 
     async def _init(self):
-        async def forward_event(event):
-            """Send local event to remote instance.
+        def state_changed(entity_id, state, attr, force_update=False):
+            """Publish remote state change on local instance.
 
-            The affected entity_id has to originate from that remote instance,
-            otherwise the event is discarded.
+            force_update is set for updates forced on the remote instance, which
+            did not change state or attributes.
             """
-            event_data = event.data
-            service_data = event_data["service_data"]
+            start = time.perf_counter()
+            if filter_state(entity_id, state, attr):
+                publish_state(entity_id, state, attr, force_update)
+            self.metrics.state_changed_time.add(time.perf_counter() - start)
 
-            if not service_data:
-                return
+        def filter_state(entity_id, state, attr):
+            """Return if a remote state change should be published now."""
+            self._all_entity_names.add(entity_id)
+
+            if not self._entity_filter.accept(entity_id, state, attr):
+                self.metrics.states_filtered += 1
+                return False
+
+            throttle = self._entity_filter.throttle(entity_id, attr)
+            if throttle and self._throttle.async_update(
+                entity_id, state, attr, *throttle, publish_state
+            ):
+                self.metrics.states_throttled += 1
+                return False
+
+            return True
 
-            entity_ids = service_data.get("entity_id", None)
+        def publish_state(entity_id, state, attr, force_update=False):
+            """Write state of a remote entity to local instance."""
+            remote_entity_id = entity_id
+            attr = self._entity_filter.filter_attributes(remote_entity_id, attr)
+
+            # Add local unique id, customization data, prefixes and picture url
+            plan = self._rewriter.rewrite(remote_entity_id, attr)
+            entity_id = plan.entity_id
+            unique_id = plan.unique_id
+            if unique_id in self._registered_unique_ids:
+                self.metrics.registry_calls_skipped += 1
+            else:
+                domain, object_id = split_entity_id(entity_id)
+                entity_registry = er.async_get(self._hass)
+                entity_registry.async_get_or_create(
+                    domain=domain,
+                    platform='remote_homeassistant',
+                    unique_id=unique_id,
+                    suggested_object_id=object_id,
+                )
+                self._registered_unique_ids.add(unique_id)
+
+            if entity_id not in self._entities:
+                self._entities.add(entity_id)
+                self._router.async_add_entity(entity_id, remote_entity_id, self)
+            self._stale_entities.discard(entity_id)
+
+            if self._skip_unchanged_states:
+                if not force_update:
+                    current = self._hass.states.get(entity_id)
+                    if (
+                        current is not None
+                        and current.state == state
+                        and current.attributes == attr
+                    ):
+                        self.metrics.states_unchanged += 1
+                        return
+                self._hass.states.async_set(
+                    entity_id, state, attr, force_update=force_update
+                )
+            else:
+                self._hass.states.async_set(entity_id, state, attr)
+
+        def entity_removed(entity_id):
+            """Remove local state of entity removed in the remote instance."""
+            self._throttle.async_remove(entity_id)
+            remote_entity_id = entity_id
+            entity_id = self._rewriter.entity_id(remote_entity_id)
+            self._rewriter.remove(remote_entity_id)
+            with suppress(ValueError, AttributeError, KeyError):
+                self._entities.remove(entity_id)
+            self._router.async_remove_entity(entity_id)
+            with suppress(ValueError, AttributeError, KeyError):
+                self._all_entity_names.remove(entity_id)
+            self._hass.states.async_remove(entity_id)
+
+        def state_changed_event(message):
+            """Publish remote state_changed event on local instance."""
+            if message["type"] != "event":
+                return
 
-            if not entity_ids:
+            data = message["event"]["data"]
+            entity_id = data["entity_id"]
+            if not data["new_state"]:
+                entity_removed(entity_id)
                 return
 
-            if isinstance(entity_ids, str):
-                entity_ids = (entity_ids.lower(),)
+            state = data["new_state"]["state"]
+            attr = data["new_state"]["attributes"]
+            old_state = data.get("old_state")
+            forced = (
+                old_state is not None
+                and old_state["state"] == state
+                and old_state["attributes"] == attr
+            )
+            # Attributes are rewritten in place, messages are shared by handlers
+            state_changed(entity_id, state, dict(attr), forced)
+
+        def forward_event(event):
+            """Fire remote event on local instance."""
+            self._hass.bus.async_fire(
+                event_type=event["event_type"],
+                event_data=event["data"],
+                context=Context(
+                    id=event["context"].get("id"),
+                    user_id=event["context"].get("user_id"),
+                    parent_id=event["context"].get("parent_id"),
+                ),
+                origin=EventOrigin.remote,
+            )
 
-            entities = {entity_id.lower() for entity_id in self._entities}
+        def fire_event(message):
+            """Publish remote event on local instance."""
+            if message["type"] == "event":
+                forward_event(message["event"])
 
-            entity_ids = entities.intersection(entity_ids)
+        async def subscribe_event(event_type):
+            """Subscribe to a remote event, filtered by event data if configured.
 
-            if not entity_ids:
+            Events with an event data filter are subscribed to with an event
+            trigger, so the remote instance only sends matching events. If that
+            is not possible (e.g. the access token is not of an admin user),
+            events are filtered locally instead.
+            """
+            event_data = self._event_data_filter.get(event_type)
+            if not event_data:
+                await self.subscribe(fire_event, "subscribe_events", event_type=event_type)
                 return
 
-            if self._entity_prefix:
-
-                def _remove_prefix(entity_id):
-                    domain, object_id = split_entity_id(entity_id)
-                    object_id = object_id.replace(self._entity_prefix.lower(), "", 1)
-                    return domain + "." + object_id
+            def fire_matching_event(message):
+                """Publish remote event if its data matches the filter."""
+                if message["type"] != "event":
+                    return
+                data = message["event"]["data"]
+                if all(data.get(key) == value for key, value in event_data.items()):
+                    forward_event(message["event"])
+
+            async def fire_trigger_event(message):
+                """Publish remote event which fired the event trigger."""
+                if message["type"] == "result":
+                    if not message["success"]:
+                        _LOGGER.warning(
+                            "could not filter %s events on remote instance (%s), "
+                            "filtering locally",
+                            event_type,
+                            message.get("error", {}).get("message"),
+                        )
+                        await self.subscribe(
+                            fire_matching_event,
+                            "subscribe_events",
+                            event_type=event_type,
+                        )
+                    return
 
-                entity_ids = {_remove_prefix(entity_id) for entity_id in entity_ids}
+                if message["type"] == "event":
+                    forward_event(message["event"]["variables"]["trigger"]["event"])
+
+            await self.subscribe(
+                fire_trigger_event,
+                "subscribe_trigger",
+                trigger={
+                    "platform": "event",
+                    "event_type": event_type,
+                    "event_data": event_data,
+                },
+            )
 
-            event_data = copy.deepcopy(event_data)
-            event_data["service_data"]["entity_id"] = list(entity_ids)
+        async def apply_states(states):
+            """Publish a full list of remote states on local instance.
 
-            # Remove service_call_id parameter - websocket API
-            # doesn't accept that one
-            event_data.pop("service_call_id", None)
+            States are applied in chunks, yielding to the event loop in between,
+            to not block it for too long on instances with many entities.
+            """
+            total = len(states)
+            for start in range(0, total, self._states_chunk_size):
+                if start > 0:
+                    await asyncio.sleep(0)
+                    if self._connection is None or self._connection.closed:
+                        return
 
-            _id = self._next_id()
-            data = {"id": _id, "type": event.event_type, **event_data}
+                for entity in states[start : start + self._states_chunk_size]:
+                    state_changed(
+                        entity["entity_id"], entity["state"], entity["attributes"]
+                    )
 
-            _LOGGER.debug("forward event: %s", data)
-            
-            if self._connection is None:
-                _LOGGER.error("There is no remote connecion to send send data to")
-                return
-            try:
-                await self._connection.send_json(data)
-            except Exception as err:
-                _LOGGER.error("could not send data to remote connection: %s", err)
-                await self._disconnected()
+                self.set_connection_state(
+                    STATE_CONNECTED,
+                    {
+                        ATTR_SYNCED_ENTITIES: min(start + self._states_chunk_size, total),
+                        ATTR_TOTAL_ENTITIES: total,
+                    },
+                )
 
-        def state_changed(entity_id, state, attr):
-            """Publish remote state change on local instance."""
-            domain, _object_id = split_entity_id(entity_id)
+            # Entities not present in the list of states were removed on the remote
+            # instance while disconnected
+            self._async_remove_stale_entities()
 
-            self._all_entity_names.add(entity_id)
+        async def got_states(message):
+            """Called when list of remote states is available."""
+            await apply_states(message["result"])
 
-            if entity_id in self._blacklist_e or domain in self._blacklist_d:
+        async def entities_changed(message):
+            """Rebuild full remote states from compressed subscribe_entities diffs."""
+            if message["type"] == "result":
+                if not message["success"]:
+                    _LOGGER.info(
+                        "subscribe_entities not supported by remote instance, "
+                        "falling back to state_changed events"
+                    )
+                    await subscribe_state_changed()
                 return
 
-            if (
-                (self._whitelist_e or self._whitelist_d)
-                and entity_id not in self._whitelist_e
-                and domain not in self._whitelist_d
-            ):
+            if message["type"] != "event":
                 return
 
-            for f in self._filter:
-                if f[CONF_ENTITY_ID] and not f[CONF_ENTITY_ID].match(entity_id):
+            event = message["event"]
+            if COMPRESSED_STATE_ADDITIONS in event:
+                added = []
+                for entity_id, compressed in event[COMPRESSED_STATE_ADDITIONS].items():
+                    state = compressed[COMPRESSED_STATE_STATE]
+                    attributes = compressed.get(COMPRESSED_STATE_ATTRIBUTES, {})
+                    self._remote_states[entity_id] = (state, attributes)
+                    added.append(
+                        {
+                            "entity_id": entity_id,
+                            "state": state,
+                            "attributes": dict(attributes),
+                        }
+                    )
+                await apply_states(added)
+
+            for entity_id, diff in event.get(COMPRESSED_STATE_CHANGES, {}).items():
+                if entity_id not in self._remote_states:
                     continue
-                if f[CONF_UNIT_OF_MEASUREMENT]:
-                    if CONF_UNIT_OF_MEASUREMENT not in attr:
-                        continue
-                    if f[CONF_UNIT_OF_MEASUREMENT] != attr[CONF_UNIT_OF_MEASUREMENT]:
-                        continue
-                try:
-                    if f[CONF_BELOW] and float(state) < f[CONF_BELOW]:
-                        _LOGGER.info(
-                            "%s: ignoring state '%s', because below '%s'",
-                            entity_id,
-                            state,
-                            f[CONF_BELOW],
-                        )
-                        return
-                    if f[CONF_ABOVE] and float(state) > f[CONF_ABOVE]:
-                        _LOGGER.info(
-                            "%s: ignoring state '%s', because above '%s'",
-                            entity_id,
-                            state,
-                            f[CONF_ABOVE],
-                        )
-                        return
-                except ValueError:
-                    pass
-
-            entity_id = self._prefixed_entity_id(entity_id)
+                state, attributes = self._remote_states[entity_id]
+                # Diffs of forced updates only carry timestamps and context
+                forced = True
+                if COMPRESSED_DIFF_ADDITIONS in diff:
+                    additions = diff[COMPRESSED_DIFF_ADDITIONS]
+                    if COMPRESSED_STATE_STATE in additions:
+                        state = additions[COMPRESSED_STATE_STATE]
+                        forced = False
+                    if COMPRESSED_STATE_ATTRIBUTES in additions:
+                        forced = False
+                        attributes = {
+                            **attributes,
+                            **additions[COMPRESSED_STATE_ATTRIBUTES],
+                        }
+                if COMPRESSED_DIFF_REMOVALS in diff:
+                    removed = diff[COMPRESSED_DIFF_REMOVALS].get(
+                        COMPRESSED_STATE_ATTRIBUTES, []
+                    )
+                    if removed:
+                        forced = False
+                    attributes = {
+                        key: value
+                        for key, value in attributes.items()
+                        if key not in removed
+                    }
+                self._remote_states[entity_id] = (state, attributes)
+                state_changed(entity_id, state, dict(attributes), forced)
 
-            # Add local unique id
-            domain, object_id = split_entity_id(entity_id)
-            attr['unique_id'] = f"{self._entry.unique_id[:16]}_{entity_id}"
-            entity_registry = er.async_get(self._hass)
-            entity_registry.async_get_or_create(
-                domain=domain,
-                platform='remote_homeassistant',
-                unique_id=attr['unique_id'],
-                suggested_object_id=object_id,
-            )
+            for entity_id in event.get(COMPRESSED_STATE_REMOVALS, []):
+                self._remote_states.pop(entity_id, None)
+                entity_removed(entity_id)
 
-            # Add local customization data
-            if DATA_CUSTOMIZE in self._hass.data:
-                attr.update(self._hass.data[DATA_CUSTOMIZE].get(entity_id))
+        async def got_entity_names(message):
+            """Called when list of remote states is available.
 
-            for attrId, value in attr.items():
-                if attrId == "friendly_name":
-                    attr[attrId] = self._prefixed_entity_friendly_name(value)
-                if attrId == "entity_picture":
-                    attr[attrId] = self._full_picture_url(value)
+            Only used to learn about all remote entities, states of included
+            entities are received via subscribe_entities.
+            """
+            for entity in message["result"]:
+                self._all_entity_names.add(entity["entity_id"])
+            await subscribe_included_entities()
+
+        async def subscribe_included_entities():
+            """Subscribe to state changes of included entities only."""
+            self._resubscribe_timer = None
+            if self._entities_subscription is not None:
+                await self.unsubscribe(self._entities_subscription)
+                self._entities_subscription = None
+
+            self._subscribed_entity_ids = {
+                entity_id
+                for entity_id in (
+                    self._all_entity_names | self._entity_filter.include_entities
+                )
+                if self._entity_filter.is_included(entity_id)
+            }
+            if not self._subscribed_entity_ids:
+                # An empty list subscribes to all entities. Nothing is included
+                # yet, so wait for entity_registry_updated to report a match.
+                # Entities kept from a previous connection no longer exist.
+                self._async_remove_stale_entities()
+                return
 
-            self._entities.add(entity_id)
-            self._hass.states.async_set(entity_id, state, attr)
+            self._entities_subscription = await self.subscribe(
+                entities_changed,
+                "subscribe_entities",
+                entity_ids=sorted(self._subscribed_entity_ids),
+            )
 
-        def fire_event(message):
-            """Publish remote event on local instance."""
-            if message["type"] == "result":
+        def entity_registry_updated(message):
+            """Re-subscribe when a new included entity appears on remote instance."""
+            if message["type"] != "event":
                 return
 
-            if message["type"] != "event":
+            data = message["event"]["data"]
+            if data.get("action") not in ("create", "update"):
                 return
 
-            if message["event"]["event_type"] == "state_changed":
-                data = message["event"]["data"]
-                entity_id = data["entity_id"]
-                if not data["new_state"]:
-                    entity_id = self._prefixed_entity_id(entity_id)
-                    # entity was removed in the remote instance
-                    with suppress(ValueError, AttributeError, KeyError):
-                        self._entities.remove(entity_id)
-                    with suppress(ValueError, AttributeError, KeyError):
-                        self._all_entity_names.remove(entity_id)
-                    self._hass.states.async_remove(entity_id)
-                    return
+            entity_id = data["entity_id"]
+            self._all_entity_names.add(entity_id)
+            if (
+                entity_id in self._subscribed_entity_ids
+                or not self._entity_filter.is_included(entity_id)
+            ):
+                return
 
-                state = data["new_state"]["state"]
-                attr = data["new_state"]["attributes"]
-                state_changed(entity_id, state, attr)
-            else:
-                event = message["event"]
-                self._hass.bus.async_fire(
-                    event_type=event["event_type"],
-                    event_data=event["data"],
-                    context=Context(
-                        id=event["context"].get("id"),
-                        user_id=event["context"].get("user_id"),
-                        parent_id=event["context"].get("parent_id"),
+            # Entities are often registered in bursts, so batch them
+            if self._resubscribe_timer is None:
+                self._resubscribe_timer = self._hass.loop.call_later(
+                    RESUBSCRIBE_DELAY,
+                    lambda: self._hass.async_create_task(
+                        subscribe_included_entities()
                     ),
-                    origin=EventOrigin.remote,
                 )
 
-        def got_states(message):
-            """Called when list of remote states is available."""
-            for entity in message["result"]:
-                entity_id = entity["entity_id"]
-                state = entity["state"]
-                attributes = entity["attributes"]
-                for attr, value in attributes.items():
-                    if attr == "friendly_name":
-                        attributes[attr] = self._prefixed_entity_friendly_name(value)
-                    if attr == "entity_picture":
-                        attributes[attr] = self._full_picture_url(value)
-
-                state_changed(entity_id, state, attributes)
-
-        self._remove_listener = self._hass.bus.async_listen(
-            EVENT_CALL_SERVICE, forward_event
+        async def subscribe_state_changed():
+            """Subscribe to full state_changed events and fetch current states."""
+            await self.subscribe(
+                state_changed_event, "subscribe_events", event_type=EVENT_STATE_CHANGED
+            )
+            await self.call(got_states, "get_states")
+
+        # Connected again, entities kept from a previous connection are removed
+        # when reconciled with the states received next, not by the grace timer
+        if self._stale_timer is not None:
+            self._stale_timer.cancel()
+            self._stale_timer = None
+
+        self._remove_listener = self._router.async_register(self)
+
+        self._remote_states = {}
+        self._entities_subscription = None
+        self._subscribed_entity_ids = set()
+        self._entity_names_partial = False
+        # Subscriptions do not wait for each other, responses are handled by the
+        # handler of each subscription
+        await asyncio.gather(
+            *(
+                subscribe_event(event)
+                for event in self._subscribe_events - set(INTERNALLY_USED_EVENTS)
+            )
         )
 
-        for event in self._subscribe_events:
-            await self.call(fire_event, "subscribe_events", event_type=event)
-
-        await self.call(got_states, "get_states")
+        if self._use_subscribe_entities and self._entity_filter.has_include:
+            # Let the remote instance filter states, only entities matching the
+            # include lists are subscribed to
+            if self._entity_filter.has_include_domains:
+                # Entities of included domains must be discovered
+                await self.subscribe(
+                    entity_registry_updated,
+                    "subscribe_events",
+                    event_type=er.EVENT_ENTITY_REGISTRY_UPDATED,
+                )
+                await self.call(got_entity_names, "get_states")
+            else:
+                # Explicitly included entities are known already, skip the
+                # list of all remote states (the largest payload there is)
+                self._entity_names_partial = True
+                await subscribe_included_entities()
+        elif self._use_subscribe_entities:
+            self._entities_subscription = await self.subscribe(
+                entities_changed, "subscribe_entities"
+            )
+        else:
+            await subscribe_state_changed()
 
         await self.proxy_services.load()
@@ -26,23 +26,42 @@ from homeassistant.util import slugify
 
 from . import async_yaml_to_config_entry
 from .const import (
+    CONF_ATTRIBUTE_FILTER,
     CONF_ENTITY_PREFIX,  # pylint:disable=unused-import
     CONF_ENTITY_FRIENDLY_NAME_PREFIX,
+    CONF_DEADBAND,
+    CONF_EVENT_DATA_FILTER,
+    CONF_EXCLUDE_ATTRIBUTES,
     CONF_EXCLUDE_DOMAINS,
     CONF_EXCLUDE_ENTITIES,
     CONF_FILTER,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HEARTBEAT_TIMEOUT,
+    CONF_INCLUDE_ATTRIBUTES,
     CONF_INCLUDE_DOMAINS,
     CONF_INCLUDE_ENTITIES,
     CONF_LOAD_COMPONENTS,
     CONF_MAIN,
+    CONF_MAX_CONCURRENT_SERVICE_CALLS,
+    CONF_MIN_INTERVAL,
     CONF_OPTIONS,
+    CONF_RECONNECT_MAX_DELAY,
+    CONF_RESTORE_STATES,
     CONF_REMOTE,
     CONF_REMOTE_CONNECTION,
     CONF_SECURE,
     CONF_SERVICE_PREFIX,
     CONF_SERVICES,
     CONF_MAX_MSG_SIZE,
+    CONF_STATES_CHUNK_SIZE,
+    CONF_RECONNECT_GRACE_PERIOD,
+    CONF_UNAVAILABLE_ON_DISCONNECT,
+    CONF_SKIP_UNCHANGED_STATES,
+    CONF_SUBSCRIBE_ENTITIES,
     CONF_SUBSCRIBE_EVENTS,
+    CONF_WEBSOCKET_HEARTBEAT,
+    CONF_RECEIVE_QUEUE_SIZE,
+    CONF_RECEIVE_QUEUE_OVERFLOW,
     DOMAIN,
     REMOTE_ID,
     DEFAULT_MAX_MSG_SIZE,
@@ -60,7 +79,46 @@ _LOGGER = logging.getLogger(__name__)
 
 ADD_NEW_EVENT = "add_new_event"
 
-FILTER_OPTIONS = [CONF_ENTITY_ID, CONF_UNIT_OF_MEASUREMENT, CONF_ABOVE, CONF_BELOW]
+FILTER_OPTIONS = [
+    CONF_ENTITY_ID,
+    CONF_UNIT_OF_MEASUREMENT,
+    CONF_ABOVE,
+    CONF_BELOW,
+    CONF_MIN_INTERVAL,
+    CONF_DEADBAND,
+]
+
+ADVANCED_OPTIONS = [
+    CONF_EVENT_DATA_FILTER,
+    CONF_STATES_CHUNK_SIZE,
+    CONF_RECONNECT_GRACE_PERIOD,
+    CONF_UNAVAILABLE_ON_DISCONNECT,
+    CONF_SUBSCRIBE_ENTITIES,
+    CONF_SKIP_UNCHANGED_STATES,
+    CONF_MAX_CONCURRENT_SERVICE_CALLS,
+    CONF_RECONNECT_MAX_DELAY,
+    CONF_RESTORE_STATES,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HEARTBEAT_TIMEOUT,
+    CONF_WEBSOCKET_HEARTBEAT,
+    CONF_RECEIVE_QUEUE_SIZE,
+    CONF_RECEIVE_QUEUE_OVERFLOW,
+]
+
+
+def _attribute_filter_str(index: int, filter_conf: Mapping[str, Any]) -> str:
+    # entity_id is optional in YAML, such a filter applies to all entities
+    entity_id = filter_conf.get(CONF_ENTITY_ID)
+    include = ", ".join(filter_conf.get(CONF_INCLUDE_ATTRIBUTES) or []) or None
+    exclude = ", ".join(filter_conf.get(CONF_EXCLUDE_ATTRIBUTES) or []) or None
+    return f"{index + 1}. {entity_id}, include: {include}, exclude: {exclude}"
+
+
+def _split_attributes(value: str | None) -> list[str]:
+    """Split comma separated list of attribute names."""
+    if not value:
+        return []
+    return [name.strip() for name in value.split(",") if name.strip()]
 
 
 def _filter_str(index: int, filter_conf: Mapping[str, str | float]) -> str:
@@ -68,7 +126,12 @@ def _filter_str(index: int, filter_conf: Mapping[str, str | float]) -> str:
     unit = filter_conf[CONF_UNIT_OF_MEASUREMENT]
     above = filter_conf[CONF_ABOVE]
     below = filter_conf[CONF_BELOW]
-    return f"{index + 1}. {entity_id}, unit: {unit}, above: {above}, below: {below}"
+    result = f"{index + 1}. {entity_id}, unit: {unit}, above: {above}, below: {below}"
+    if filter_conf.get(CONF_MIN_INTERVAL) or filter_conf.get(CONF_DEADBAND):
+        min_interval = filter_conf.get(CONF_MIN_INTERVAL)
+        deadband = filter_conf.get(CONF_DEADBAND)
+        result += f", min interval: {min_interval}, deadband: {deadband}"
+    return result
 
 
 async def validate_input(hass: core.HomeAssistant, conf):
@@ -252,6 +315,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         """Initialize remote_homeassistant options flow."""
         # self.config_entry wird von Home Assistant gesetzt (read-only Property)
         self.filters: list[Any] | None = None
+        self.attribute_filters: list[Any] | None = None
         self.events: set[Any] | None = None
         self.options: dict[str, Any] | None = None
 
@@ -263,10 +327,16 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_abort(reason="not_supported")
 
         if user_input is not None:
-            self.options = user_input.copy()
+            # Options only configurable via YAML are not part of the flow
+            self.options = {
+                conf: self.config_entry.options[conf]
+                for conf in ADVANCED_OPTIONS
+                if conf in self.config_entry.options
+            }
+            self.options.update(user_input)
             return await self.async_step_domain_entity_filters()
 
-        domains, _ = self._domains_and_entities()
+        domains, _ = await self._async_domains_and_entities()
         domains = set(
             domains + self.config_entry.options.get(CONF_LOAD_COMPONENTS, [])
         )
@@ -318,7 +388,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             self.options.update(user_input)
             return await self.async_step_general_filters()
 
-        domains, entities = self._domains_and_entities()
+        domains, entities = await self._async_domains_and_entities()
         return self.async_show_form(
             step_id="domain_entity_filters",
             data_schema=vol.Schema(
@@ -358,7 +428,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     self.options[CONF_FILTER] = [
                         self.filters[i] for i in selected_indices  # type: ignore
                     ]
-                return await self.async_step_events()
+                return await self.async_step_attribute_filters()
 
             selected = user_input.get(CONF_FILTER, [])
             new_filter = {conf: user_input.get(conf) for conf in FILTER_OPTIONS}
@@ -389,6 +459,65 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(CONF_UNIT_OF_MEASUREMENT): str,
                     vol.Optional(CONF_ABOVE): vol.Coerce(float),
                     vol.Optional(CONF_BELOW): vol.Coerce(float),
+                    vol.Optional(CONF_MIN_INTERVAL): vol.Coerce(float),
+                    vol.Optional(CONF_DEADBAND): vol.Coerce(float),
+                }
+            ),
+        )
+
+    async def async_step_attribute_filters(self, user_input=None):
+        """Manage attribute filters."""
+        if user_input is not None:
+            # Continue to next step if entity id is not specified
+            if CONF_ENTITY_ID not in user_input:
+                selected_indices = [
+                    int(filter_item.split(".")[0]) - 1
+                    for filter_item in user_input.get(CONF_ATTRIBUTE_FILTER, [])
+                ]
+                if self.options is not None:
+                    self.options[CONF_ATTRIBUTE_FILTER] = [
+                        self.attribute_filters[i] for i in selected_indices  # type: ignore
+                    ]
+                return await self.async_step_events()
+
+            selected = user_input.get(CONF_ATTRIBUTE_FILTER, [])
+            new_filter = {
+                CONF_ENTITY_ID: user_input[CONF_ENTITY_ID],
+                CONF_INCLUDE_ATTRIBUTES: _split_attributes(
+                    user_input.get(CONF_INCLUDE_ATTRIBUTES)
+                ),
+                CONF_EXCLUDE_ATTRIBUTES: _split_attributes(
+                    user_input.get(CONF_EXCLUDE_ATTRIBUTES)
+                ),
+            }
+
+            selected.append(
+                _attribute_filter_str(len(self.attribute_filters), new_filter)  # type: ignore
+            )
+            self.attribute_filters.append(new_filter)  # type: ignore
+        else:
+            self.attribute_filters = list(
+                self.config_entry.options.get(CONF_ATTRIBUTE_FILTER, [])
+            )
+            selected = [
+                _attribute_filter_str(i, filter_item)
+                for i, filter_item in enumerate(self.attribute_filters)
+            ]
+
+        strings = [
+            _attribute_filter_str(i, filter_item)
+            for i, filter_item in enumerate(self.attribute_filters)  # type: ignore
+        ]
+        return self.async_show_form(
+            step_id="attribute_filters",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_ATTRIBUTE_FILTER, default=selected
+                    ): cv.multi_select(strings),
+                    vol.Optional(CONF_ENTITY_ID): str,
+                    vol.Optional(CONF_INCLUDE_ATTRIBUTES): str,
+                    vol.Optional(CONF_EXCLUDE_ATTRIBUTES): str,
                 }
             ),
         )
@@ -429,7 +558,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         """Return default value for an option."""
         return self.config_entry.options.get(conf) or vol.UNDEFINED
 
-    def _domains_and_entities(self):
+    async def _async_domains_and_entities(self):
         """Return all entities and domains exposed by remote instance."""
         remote = self.hass.data[DOMAIN][self.config_entry.entry_id][
             CONF_REMOTE_CONNECTION
@@ -445,7 +574,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             self.config_entry.options.get(CONF_EXCLUDE_ENTITIES, [])
         )
         entities = sorted(
-            remote._all_entity_names | include_entities | exclude_entities
+            await remote.async_get_entity_names() | include_entities | exclude_entities
         )
         domains = sorted({entity_id.split(".")[0] for entity_id in entities})
         return domains, entities
@@ -1,6 +1,7 @@
 """Constants used by integration."""
 
 CONF_REMOTE_CONNECTION = "remote_connection"
+CONF_SERVICE_ROUTER = "service_router"
 CONF_UNSUB_LISTENER = "unsub_listener"
 CONF_OPTIONS = "options"
 CONF_REMOTE_INFO = "remote_info"
@@ -9,12 +10,31 @@ CONF_SERVICE_PREFIX = "service_prefix"
 CONF_SERVICES = "services"
 
 CONF_FILTER = "filter"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_DEADBAND = "deadband"
+CONF_ATTRIBUTE_FILTER = "attribute_filter"
+CONF_INCLUDE_ATTRIBUTES = "include_attributes"
+CONF_EXCLUDE_ATTRIBUTES = "exclude_attributes"
 CONF_SECURE = "secure"
 CONF_API_PASSWORD = "api_password"
 CONF_SUBSCRIBE_EVENTS = "subscribe_events"
+CONF_EVENT_DATA_FILTER = "event_data_filter"
 CONF_ENTITY_PREFIX = "entity_prefix"
 CONF_ENTITY_FRIENDLY_NAME_PREFIX = "entity_friendly_name_prefix"
 CONF_MAX_MSG_SIZE = "max_message_size"
+CONF_STATES_CHUNK_SIZE = "states_chunk_size"
+CONF_RECONNECT_GRACE_PERIOD = "reconnect_grace_period"
+CONF_UNAVAILABLE_ON_DISCONNECT = "unavailable_on_disconnect"
+CONF_SUBSCRIBE_ENTITIES = "subscribe_entities"
+CONF_SKIP_UNCHANGED_STATES = "skip_unchanged_states"
+CONF_MAX_CONCURRENT_SERVICE_CALLS = "max_concurrent_service_calls"
+CONF_RECONNECT_MAX_DELAY = "reconnect_max_delay"
+CONF_RESTORE_STATES = "restore_states"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_HEARTBEAT_TIMEOUT = "heartbeat_timeout"
+CONF_WEBSOCKET_HEARTBEAT = "websocket_heartbeat"
+CONF_RECEIVE_QUEUE_SIZE = "receive_queue_size"
+CONF_RECEIVE_QUEUE_OVERFLOW = "receive_queue_overflow"
 
 CONF_INCLUDE_DOMAINS = "include_domains"
 CONF_INCLUDE_ENTITIES = "include_entities"
@@ -33,3 +53,17 @@ REMOTE_ID = "remote"
 SERVICE_CALL_LIMIT = 10
 
 DEFAULT_MAX_MSG_SIZE = 16*1024*1024
+
+DEFAULT_STATES_CHUNK_SIZE = 500
+DEFAULT_MAX_CONCURRENT_SERVICE_CALLS = 10
+DEFAULT_RECONNECT_MAX_DELAY = 60
+DEFAULT_HEARTBEAT_INTERVAL = 20
+DEFAULT_HEARTBEAT_TIMEOUT = 5
+DEFAULT_RECEIVE_QUEUE_SIZE = 1000
+
+# Overflow policies of the receive queue
+RECEIVE_QUEUE_BLOCK = "block"
+RECEIVE_QUEUE_DROP_SUPERSEDED = "drop_superseded"
+
+ATTR_SYNCED_ENTITIES = "synced_entities"
+ATTR_TOTAL_ENTITIES = "total_entities"
@@ -0,0 +1,32 @@
+"""Diagnostics support for Remote Home-Assistant."""
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_REMOTE_CONNECTION, DOMAIN
+
+TO_REDACT = {CONF_ACCESS_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+    }
+
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data is not None:
+        remote = data[CONF_REMOTE_CONNECTION]
+        diagnostics["metrics"] = {
+            **remote.metrics.as_dict(),
+            "pending_requests": remote.pending_requests,
+            "service_calls_pending": remote.service_calls_pending,
+            "receive_queue_size": remote.receive_queue_size,
+        }
+    return diagnostics
@@ -0,0 +1,225 @@
+"""Compiled filter deciding which remote entities are published locally."""
+from __future__ import annotations
+import fnmatch
+import logging
+import re
+from typing import Any, Mapping
+
+from homeassistant.const import (CONF_ABOVE, CONF_BELOW, CONF_ENTITY_ID,
+                                 CONF_UNIT_OF_MEASUREMENT)
+from homeassistant.core import split_entity_id
+
+from .const import (CONF_ATTRIBUTE_FILTER, CONF_DEADBAND,
+                    CONF_EXCLUDE_ATTRIBUTES, CONF_EXCLUDE_DOMAINS,
+                    CONF_EXCLUDE_ENTITIES, CONF_FILTER, CONF_INCLUDE_ATTRIBUTES,
+                    CONF_INCLUDE_DOMAINS, CONF_INCLUDE_ENTITIES,
+                    CONF_MIN_INTERVAL)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Marker for entities rejected by include/exclude configuration
+_EXCLUDED = None
+
+
+def _compile_pattern(filter_conf: Mapping[str, Any]) -> re.Pattern | None:
+    """Compile entity_id glob of a filter."""
+    if not filter_conf.get(CONF_ENTITY_ID):
+        return None
+    return re.compile(fnmatch.translate(filter_conf[CONF_ENTITY_ID]))
+
+
+class EntityFilter:
+    """Include/exclude and threshold filters compiled into per-entity plans.
+
+    A plan is computed the first time an entity_id is seen and cached for the
+    lifetime of the filter (options changes reload the config entry, which
+    creates a new filter). A plan maps unit of measurement (None for filters
+    not restricted to a unit) to the (above, below) thresholds that apply.
+    """
+
+    def __init__(self, options: Mapping[str, Any]):
+        """Initialize a new EntityFilter."""
+        # see homeassistant/components/influxdb/__init__.py
+        # for include/exclude logic
+        self._whitelist_e = set(options.get(CONF_INCLUDE_ENTITIES, []))
+        self._whitelist_d = set(options.get(CONF_INCLUDE_DOMAINS, []))
+        self._blacklist_e = set(options.get(CONF_EXCLUDE_ENTITIES, []))
+        self._blacklist_d = set(options.get(CONF_EXCLUDE_DOMAINS, []))
+
+        # Filters without any threshold can never reject a state
+        self._filters = [
+            (
+                _compile_pattern(f),
+                f.get(CONF_UNIT_OF_MEASUREMENT) or None,
+                f.get(CONF_ABOVE),
+                f.get(CONF_BELOW),
+            )
+            for f in options.get(CONF_FILTER, [])
+            if f.get(CONF_ABOVE) or f.get(CONF_BELOW)
+        ]
+        self._throttle_filters = [
+            (
+                _compile_pattern(f),
+                f.get(CONF_UNIT_OF_MEASUREMENT) or None,
+                f.get(CONF_MIN_INTERVAL),
+                f.get(CONF_DEADBAND),
+            )
+            for f in options.get(CONF_FILTER, [])
+            if f.get(CONF_MIN_INTERVAL) or f.get(CONF_DEADBAND)
+        ]
+        # Allow-list (None if all are allowed) and deny-list of attributes
+        self._attribute_filters = [
+            (
+                _compile_pattern(f),
+                set(f[CONF_INCLUDE_ATTRIBUTES])
+                if f.get(CONF_INCLUDE_ATTRIBUTES)
+                else None,
+                set(f.get(CONF_EXCLUDE_ATTRIBUTES) or []),
+            )
+            for f in options.get(CONF_ATTRIBUTE_FILTER, [])
+        ]
+
+        self._plans: dict[str, dict[str | None, list] | None] = {}
+        self._throttles: dict[
+            tuple[str, str | None], tuple[float | None, float | None] | None
+        ] = {}
+        self._attributes: dict[str, tuple[set[str] | None, set[str]] | None] = {}
+
+    @property
+    def has_include(self) -> bool:
+        """Return if an explicit include list is configured."""
+        return bool(self._whitelist_e or self._whitelist_d)
+
+    @property
+    def include_entities(self) -> set[str]:
+        """Return explicitly included entity ids."""
+        return self._whitelist_e
+
+    @property
+    def has_include_domains(self) -> bool:
+        """Return if whole domains are included."""
+        return bool(self._whitelist_d)
+
+    def _compile(self, entity_id: str) -> dict[str | None, list] | None:
+        """Compute filter plan for an entity."""
+        domain, _ = split_entity_id(entity_id)
+
+        if entity_id in self._blacklist_e or domain in self._blacklist_d:
+            return _EXCLUDED
+
+        if (
+            self.has_include
+            and entity_id not in self._whitelist_e
+            and domain not in self._whitelist_d
+        ):
+            return _EXCLUDED
+
+        plan: dict[str | None, list] = {}
+        for pattern, unit, above, below in self._filters:
+            if pattern and not pattern.match(entity_id):
+                continue
+            plan.setdefault(unit, []).append((above, below))
+        return plan
+
+    def is_included(self, entity_id: str) -> bool:
+        """Return if entity passes include/exclude configuration."""
+        return self.plan(entity_id) is not _EXCLUDED
+
+    def plan(self, entity_id: str) -> dict[str | None, list] | None:
+        """Return (cached) filter plan for an entity."""
+        try:
+            return self._plans[entity_id]
+        except KeyError:
+            plan = self._plans[entity_id] = self._compile(entity_id)
+            return plan
+
+    def throttle(
+        self, entity_id: str, attr: Mapping[str, Any]
+    ) -> tuple[float | None, float | None] | None:
+        """Return (min_interval, deadband) of first matching filter, if any.
+
+        Filters restricted to a unit of measurement only match states with
+        that unit, so the result is cached per entity and unit.
+        """
+        unit = attr.get(CONF_UNIT_OF_MEASUREMENT)
+        key = (entity_id, unit)
+        try:
+            return self._throttles[key]
+        except KeyError:
+            pass
+
+        throttle = None
+        for pattern, filter_unit, min_interval, deadband in self._throttle_filters:
+            if pattern is not None and not pattern.match(entity_id):
+                continue
+            if filter_unit is not None and filter_unit != unit:
+                continue
+            throttle = (min_interval, deadband)
+            break
+        self._throttles[key] = throttle
+        return throttle
+
+    def filter_attributes(self, entity_id: str, attr: dict) -> dict:
+        """Return attributes of an entity without the filtered ones.
+
+        The first attribute filter matching the entity applies. Excluded
+        attributes are removed from attr in place.
+        """
+        try:
+            rule = self._attributes[entity_id]
+        except KeyError:
+            rule = None
+            for pattern, include, exclude in self._attribute_filters:
+                if pattern is None or pattern.match(entity_id):
+                    rule = (include, exclude)
+                    break
+            self._attributes[entity_id] = rule
+
+        if rule is None:
+            return attr
+
+        include, exclude = rule
+        if include is not None:
+            attr = {key: value for key, value in attr.items() if key in include}
+        for key in exclude:
+            attr.pop(key, None)
+        return attr
+
+    def accept(self, entity_id: str, state: str, attr: Mapping[str, Any]) -> bool:
+        """Return if a state for an entity should be published."""
+        plan = self.plan(entity_id)
+        if plan is _EXCLUDED:
+            return False
+        if not plan:
+            return True
+
+        thresholds = plan.get(None, [])
+        unit = attr.get(CONF_UNIT_OF_MEASUREMENT)
+        if unit is not None and unit in plan:
+            thresholds = thresholds + plan[unit]
+        if not thresholds:
+            return True
+
+        try:
+            value = float(state)
+        except ValueError:
+            return True
+
+        for above, below in thresholds:
+            if below and value < below:
+                _LOGGER.info(
+                    "%s: ignoring state '%s', because below '%s'",
+                    entity_id,
+                    state,
+                    below,
+                )
+                return False
+            if above and value > above:
+                _LOGGER.info(
+                    "%s: ignoring state '%s', because above '%s'",
+                    entity_id,
+                    state,
+                    above,
+                )
+                return False
+        return True
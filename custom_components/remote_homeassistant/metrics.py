@@ -0,0 +1,124 @@
+"""Performance counters for remote connections."""
+from __future__ import annotations
+from collections import deque
+import time
+
+# Number of samples kept by a histogram
+HISTOGRAM_SIZE = 1000
+
+# Interval in seconds over which the message rate is calculated
+RATE_INTERVAL = 10
+
+
+class Histogram:
+    """Rolling window of samples summarized as percentiles."""
+
+    def __init__(self, size: int = HISTOGRAM_SIZE):
+        """Initialize a new Histogram."""
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, percent: float) -> float | None:
+        """Return percentile of samples in window, None if there are none."""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return summary of histogram."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": max(self._samples) if self._samples else None,
+        }
+
+
+class ConnectionMetrics:
+    """Counters and histograms for a RemoteConnection.
+
+    Durations are in seconds.
+    """
+
+    def __init__(self):
+        """Initialize a new ConnectionMetrics."""
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.states_filtered = 0
+        self.states_throttled = 0
+        self.states_unchanged = 0
+        self.service_calls_forwarded = 0
+        self.service_call_failures = 0
+        self.registry_calls_skipped = 0
+        self.subscriptions_shared = 0
+        self.reconnects = 0
+        self.max_pending_requests = 0
+        self.max_service_calls_pending = 0
+        self.max_receive_queue_size = 0
+        self.messages_superseded = 0
+        self.decode_time = Histogram()
+        self.state_changed_time = Histogram()
+        self.heartbeat_rtt = Histogram()
+        self.service_call_latency = Histogram()
+        self.receive_lag = Histogram()
+
+        self._rate_start = time.monotonic()
+        self._rate_count = 0
+        self._rate = 0.0
+
+    def message_received(self, size: int) -> None:
+        """Count a received websocket frame."""
+        self.messages_received += 1
+        self.bytes_received += size
+        self._rate_count += 1
+
+        now = time.monotonic()
+        elapsed = now - self._rate_start
+        if elapsed >= RATE_INTERVAL:
+            self._rate = self._rate_count / elapsed
+            self._rate_start = now
+            self._rate_count = 0
+
+    @property
+    def messages_per_second(self) -> float:
+        """Return rate of received messages."""
+        elapsed = time.monotonic() - self._rate_start
+        if elapsed >= RATE_INTERVAL:
+            # No message received for a while, rate is not up to date
+            return self._rate_count / elapsed
+        return self._rate
+
+    def as_dict(self) -> dict:
+        """Return all metrics."""
+        return {
+            "messages_received": self.messages_received,
+            "messages_per_second": round(self.messages_per_second, 2),
+            "bytes_received": self.bytes_received,
+            "states_filtered": self.states_filtered,
+            "states_throttled": self.states_throttled,
+            "states_unchanged": self.states_unchanged,
+            "service_calls_forwarded": self.service_calls_forwarded,
+            "service_call_failures": self.service_call_failures,
+            "registry_calls_skipped": self.registry_calls_skipped,
+            "subscriptions_shared": self.subscriptions_shared,
+            "reconnects": self.reconnects,
+            "max_pending_requests": self.max_pending_requests,
+            "max_service_calls_pending": self.max_service_calls_pending,
+            "max_receive_queue_size": self.max_receive_queue_size,
+            "messages_superseded": self.messages_superseded,
+            "decode_time": self.decode_time.as_dict(),
+            "state_changed_time": self.state_changed_time.as_dict(),
+            "heartbeat_rtt": self.heartbeat_rtt.as_dict(),
+            "service_call_latency": self.service_call_latency.as_dict(),
+            "receive_lag": self.receive_lag.as_dict(),
+        }
@@ -1,13 +1,18 @@
 """Support for proxy services."""
 from __future__ import annotations
 import asyncio
-from typing import Any
 
 import voluptuous as vol
+from homeassistant.const import EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED
+try:
+    from homeassistant.core import SupportsResponse
+except (ModuleNotFoundError, ImportError):
+    # hass 2023.6 or older, services cannot return responses
+    SupportsResponse = None
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.service import SERVICE_DESCRIPTION_CACHE
 
-from .const import CONF_SERVICE_PREFIX, CONF_SERVICES, SERVICE_CALL_LIMIT
+from .const import CONF_SERVICE_PREFIX, CONF_SERVICES
 
 
 class ProxyServices:
@@ -31,7 +36,21 @@ class ProxyServices:
         return sorted(result)
 
     async def load(self):
-        """Call to make initial registration of services."""
+        """Call to make initial registration of services.
+
+        The full catalog of remote services is fetched on every (re)connect,
+        since services can change while disconnected without any other sign
+        (e.g. reloading scripts). While connected it is kept up to date via
+        service_registered and service_removed events.
+        """
+        await asyncio.gather(
+            *(
+                self.remote.subscribe(
+                    self._async_service_event, "subscribe_events", event_type=event_type
+                )
+                for event_type in (EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED)
+            )
+        )
         await self.remote.call(self._async_got_services, "get_services")
 
     async def unload(self):
@@ -45,65 +64,116 @@ class ProxyServices:
             service = f"{domain}.{service_name}"
             if service in description_cache:
                 del description_cache[service]
+        self.registered_services = []
 
     async def _async_got_services(self, message):
         """Called when list of remote services is available."""
         self.remote_services = message["result"]
 
+        # Services removed on the remote instance while disconnected
+        service_prefix = self.entry.options.get(CONF_SERVICE_PREFIX, "")
+        for domain, service in list(self.registered_services):
+            service_name = service[len(service_prefix) :]
+            if service_name not in self.remote_services.get(domain, {}):
+                self._async_remove_service(domain, service_name)
+
+        for service in self.entry.options.get(CONF_SERVICES, []):
+            domain, service_name = service.split(".")
+            if service_name in self.remote_services.get(domain, {}):
+                self._async_register_service(domain, service_name)
+
+    def _async_service_event(self, message):
+        """Patch catalog when a service is registered or removed on remote."""
+        if message["type"] != "event":
+            return
+
+        event = message["event"]
+        domain = event["data"]["domain"]
+        service_name = event["data"]["service"]
+        configured = f"{domain}.{service_name}" in self.entry.options.get(
+            CONF_SERVICES, []
+        )
+
+        if event["event_type"] == EVENT_SERVICE_REGISTERED:
+            self.remote_services.setdefault(domain, {}).setdefault(service_name, {})
+            if configured:
+                self._async_register_service(domain, service_name)
+        else:
+            services = self.remote_services.get(domain, {})
+            services.pop(service_name, None)
+            if not services:
+                self.remote_services.pop(domain, None)
+            if configured:
+                self._async_remove_service(domain, service_name)
+
+    def _async_register_service(self, domain, service_name):
+        """Register proxy service for a remote service."""
         # A service prefix is needed to not clash with original service names
         service_prefix = self.entry.options.get(CONF_SERVICE_PREFIX)
         if not service_prefix:
             return
 
+        service = service_prefix + service_name
+        if (domain, service) in self.registered_services:
+            return
+
+        # Register new service with same name as original service but with prefix
+        kwargs = {}
+        if SupportsResponse is not None:
+            kwargs["supports_response"] = SupportsResponse.OPTIONAL
+        self.hass.services.async_register(
+            domain,
+            service,
+            self._async_handle_service_call,
+            vol.Schema({}, extra=vol.ALLOW_EXTRA),
+            **kwargs,
+        )
+
+        # <HERE_BE_DRAGON>
+        # Service metadata can only be provided via a services.yaml file for a
+        # particular component, something not possible here. A cache is used
+        # internally for loaded service descriptions and that's abused here. If
+        # the internal representation of the cache change, this sill break.
+        # </HERE_BE_DRAGONS>
         description_cache = self.hass.data[SERVICE_DESCRIPTION_CACHE]
-        for service in self.entry.options.get(CONF_SERVICES, []):
-            domain, service_name = service.split(".")
-            service = service_prefix + service_name
-
-            # Register new service with same name as original service but with prefix
-            self.hass.services.async_register(
-                domain,
-                service,
-                self._async_handle_service_call,
-                vol.Schema({}, extra=vol.ALLOW_EXTRA),
-            )
+        service_info = self.remote_services.get(domain, {}).get(service_name)
+        if service_info:
+            description_cache[f"{domain}.{service}"] = service_info
 
-            # <HERE_BE_DRAGON>
-            # Service metadata can only be provided via a services.yaml file for a
-            # particular component, something not possible here. A cache is used
-            # internally for loaded service descriptions and that's abused here. If
-            # the internal representation of the cache change, this sill break.
-            # </HERE_BE_DRAGONS>
-            service_info = self.remote_services.get(domain, {}).get(service_name)
-            if service_info:
-                description_cache[f"{domain}.{service}"] = service_info
+        self.registered_services.append((domain, service))
 
-            self.registered_services.append((domain, service))
+    def _async_remove_service(self, domain, service_name):
+        """Remove proxy service of a service removed on remote instance."""
+        service = self.entry.options.get(CONF_SERVICE_PREFIX, "") + service_name
+        if (domain, service) not in self.registered_services:
+            return
 
-    async def _async_handle_service_call(self, event) -> None:
-        """Handle service call to proxy service."""
-        # An exception must be raised from the service call handler (thus method) in
-        # order to end up in the frontend. The code below synchronizes reception of
-        # the service call result, so potential error message can be used as exception
-        # message. Not very pretty...
-        ev = asyncio.Event()
-        res : dict[str,Any] | None = None
+        self.hass.services.async_remove(domain, service)
+        self.hass.data[SERVICE_DESCRIPTION_CACHE].pop(f"{domain}.{service}", None)
+        self.registered_services.remove((domain, service))
 
-        def _resp(message):
-            nonlocal res
-            res = message
-            ev.set()
+    async def _async_handle_service_call(self, event):
+        """Handle service call to proxy service.
 
+        Returns the response of the remote service if the caller asked for it.
+        """
+        # An exception must be raised from the service call handler (thus method) in
+        # order to end up in the frontend, so errors reported by the remote instance
+        # are raised as HomeAssistantError. Concurrency, deadline and eviction of the
+        # pending request (also when this call is cancelled) are handled by the
+        # connection.
         service_prefix = self.entry.options.get(CONF_SERVICE_PREFIX)
         service = event.service[len(service_prefix) :]
-        await self.remote.call(
-            _resp,
-            "call_service",
-            domain=event.domain,
-            service=service,
-            service_data=event.data.copy(),
-        )
-
-        await asyncio.wait_for(ev.wait(), SERVICE_CALL_LIMIT)
-        if isinstance(res, dict) and not res["success"]:
-            raise HomeAssistantError(res["error"]["message"])
+        return_response = getattr(event, "return_response", False)
+        try:
+            result = await self.remote.async_call_service(
+                event.domain, service, event.data.copy(), return_response
+            )
+        except asyncio.TimeoutError as err:
+            raise HomeAssistantError(
+                f"No response from remote instance for {event.domain}.{service}"
+            ) from err
+
+        if return_response:
+            return result.get("response")
+        return None
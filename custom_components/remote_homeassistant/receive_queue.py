@@ -0,0 +1,94 @@
+"""Bounded queue between websocket reader and message dispatcher."""
+from __future__ import annotations
+import asyncio
+from collections import deque
+import time
+from typing import Any, Hashable
+
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from .const import RECEIVE_QUEUE_DROP_SUPERSEDED
+from .metrics import ConnectionMetrics
+
+
+def _superseding_key(message: dict[str, Any]) -> Hashable | None:
+    """Return key of state_changed events that replace each other, if any."""
+    if message.get("type") != "event":
+        return None
+    event = message.get("event")
+    if not isinstance(event, dict) or event.get("event_type") != EVENT_STATE_CHANGED:
+        return None
+    return (message["id"], event["data"]["entity_id"])
+
+
+class ReceiveQueue:
+    """Messages received from a remote instance waiting to be dispatched.
+
+    When the queue is full the reader waits for the dispatcher to catch up. With
+    the drop_superseded policy a state_changed event for an entity that still
+    has an older state_changed event queued replaces the older one in place, so
+    a backlog does not grow with updates nobody will see.
+    """
+
+    def __init__(
+        self, maxsize: int, overflow: str, metrics: ConnectionMetrics
+    ):
+        """Initialize a new ReceiveQueue."""
+        self._maxsize = maxsize
+        self._drop_superseded = overflow == RECEIVE_QUEUE_DROP_SUPERSEDED
+        self._metrics = metrics
+        # Entries are [message, superseding key, time queued]
+        self._entries: deque[list] = deque()
+        self._superseding: dict[Hashable, list] = {}
+        self._closed = False
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    def __len__(self) -> int:
+        """Return number of queued messages."""
+        return len(self._entries)
+
+    async def put(self, message: dict[str, Any]) -> None:
+        """Queue a message, waits while the queue is full."""
+        key = _superseding_key(message) if self._drop_superseded else None
+        if key is not None:
+            entry = self._superseding.get(key)
+            if entry is not None:
+                entry[0] = message
+                self._metrics.messages_superseded += 1
+                return
+
+        while len(self._entries) >= self._maxsize:
+            self._writable.clear()
+            await self._writable.wait()
+
+        entry = [message, key, time.monotonic()]
+        self._entries.append(entry)
+        if key is not None:
+            self._superseding[key] = entry
+        self._metrics.max_receive_queue_size = max(
+            self._metrics.max_receive_queue_size, len(self._entries)
+        )
+        self._readable.set()
+
+    def close(self) -> None:
+        """Stop accepting messages, get returns None once queue is drained."""
+        self._closed = True
+        self._readable.set()
+
+    async def get(self) -> dict[str, Any] | None:
+        """Return next message, None when the queue is closed and empty."""
+        while not self._entries:
+            if self._closed:
+                return None
+            self._readable.clear()
+            await self._readable.wait()
+
+        entry = self._entries.popleft()
+        message, key, queued_at = entry
+        if key is not None and self._superseding.get(key) is entry:
+            del self._superseding[key]
+        self._metrics.receive_lag.add(time.monotonic() - queued_at)
+        self._writable.set()
+        return message
@@ -1,16 +1,156 @@
 """Sensor platform for connection status.."""
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_VERIFY_SSL
+from datetime import timedelta
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import (CONF_HOST, CONF_PORT, CONF_VERIFY_SSL,
+                                 EntityCategory)
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, Entity
 
 from .const import (DOMAIN, CONF_ENTITY_PREFIX,
                     CONF_ENTITY_FRIENDLY_NAME_PREFIX,
-                    CONF_SECURE, CONF_MAX_MSG_SIZE,
+                    CONF_REMOTE_CONNECTION, CONF_SECURE, CONF_MAX_MSG_SIZE,
                     DEFAULT_MAX_MSG_SIZE)
 
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+def _histogram_ms(histogram):
+    """Return median of a histogram in milliseconds."""
+    value = histogram.percentile(50)
+    return round(value * 1000, 2) if value is not None else None
+
+
+def _histogram_ms_attributes(histogram):
+    """Return summary of a histogram in milliseconds."""
+    return {
+        key: round(value * 1000, 2) if value is not None else None
+        for key, value in histogram.as_dict().items()
+        if key in ("p99", "max")
+    }
+
+
+# key: (name, unit, state class, value function, attributes function)
+METRIC_SENSORS = {
+    "messages_per_second": (
+        "Messages per second",
+        "msg/s",
+        SensorStateClass.MEASUREMENT,
+        lambda remote: round(remote.metrics.messages_per_second, 2),
+        None,
+    ),
+    "bytes_received": (
+        "Bytes received",
+        "B",
+        SensorStateClass.TOTAL_INCREASING,
+        lambda remote: remote.metrics.bytes_received,
+        None,
+    ),
+    "decode_time": (
+        "Decode time",
+        "ms",
+        SensorStateClass.MEASUREMENT,
+        lambda remote: _histogram_ms(remote.metrics.decode_time),
+        lambda remote: _histogram_ms_attributes(remote.metrics.decode_time),
+    ),
+    "state_changed_time": (
+        "State processing time",
+        "ms",
+        SensorStateClass.MEASUREMENT,
+        lambda remote: _histogram_ms(remote.metrics.state_changed_time),
+        lambda remote: _histogram_ms_attributes(remote.metrics.state_changed_time),
+    ),
+    "states_filtered": (
+        "Filtered states",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda remote: remote.metrics.states_filtered,
+        lambda remote: {
+            "throttled": remote.metrics.states_throttled,
+            "unchanged": remote.metrics.states_unchanged,
+        },
+    ),
+    "service_calls_forwarded": (
+        "Forwarded service calls",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda remote: remote.metrics.service_calls_forwarded,
+        lambda remote: {"failures": remote.metrics.service_call_failures},
+    ),
+    "service_call_latency": (
+        "Service call latency",
+        "ms",
+        SensorStateClass.MEASUREMENT,
+        lambda remote: _histogram_ms(remote.metrics.service_call_latency),
+        lambda remote: _histogram_ms_attributes(remote.metrics.service_call_latency),
+    ),
+    "heartbeat_rtt": (
+        "Heartbeat round-trip time",
+        "ms",
+        SensorStateClass.MEASUREMENT,
+        lambda remote: _histogram_ms(remote.metrics.heartbeat_rtt),
+        lambda remote: _histogram_ms_attributes(remote.metrics.heartbeat_rtt),
+    ),
+    "reconnects": (
+        "Reconnects",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda remote: remote.metrics.reconnects,
+        None,
+    ),
+    "pending_requests": (
+        "Pending requests",
+        None,
+        SensorStateClass.MEASUREMENT,
+        lambda remote: remote.pending_requests,
+        lambda remote: {"max": remote.metrics.max_pending_requests},
+    ),
+    "service_calls_pending": (
+        "Pending service calls",
+        None,
+        SensorStateClass.MEASUREMENT,
+        lambda remote: remote.service_calls_pending,
+        lambda remote: {"max": remote.metrics.max_service_calls_pending},
+    ),
+    "receive_queue_size": (
+        "Receive queue",
+        None,
+        SensorStateClass.MEASUREMENT,
+        lambda remote: remote.receive_queue_size,
+        lambda remote: {
+            "max": remote.metrics.max_receive_queue_size,
+            "superseded": remote.metrics.messages_superseded,
+        },
+    ),
+    "receive_lag": (
+        "Receive lag",
+        "ms",
+        SensorStateClass.MEASUREMENT,
+        lambda remote: _histogram_ms(remote.metrics.receive_lag),
+        lambda remote: _histogram_ms_attributes(remote.metrics.receive_lag),
+    ),
+}
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up sensor based ok config entry."""
-    async_add_entities([ConnectionStatusSensor(config_entry)])
+    remote = hass.data[DOMAIN][config_entry.entry_id][CONF_REMOTE_CONNECTION]
+    async_add_entities(
+        [ConnectionStatusSensor(config_entry)]
+        + [RemoteMetricSensor(config_entry, remote, key) for key in METRIC_SENSORS]
+    )
+
+
+def _device_info(config_entry):
+    """Return device info of remote instance."""
+    proto = 'http' if config_entry.data.get(CONF_SECURE) else 'https'
+    host = config_entry.data[CONF_HOST]
+    port = config_entry.data[CONF_PORT]
+    return DeviceInfo(
+        name="Home Assistant",
+        configuration_url=f"{proto}://{host}:{port}",
+        identifiers={(DOMAIN, f"remote_{config_entry.unique_id}")},
+    )
 
 
 class ConnectionStatusSensor(Entity):
@@ -19,19 +159,15 @@ class ConnectionStatusSensor(Entity):
     def __init__(self, config_entry):
         """Initialize the remote_homeassistant sensor."""
         self._state = None
+        self._progress = {}
         self._entry = config_entry
 
-        proto = 'http' if config_entry.data.get(CONF_SECURE) else 'https'
         host = config_entry.data[CONF_HOST]
         port = config_entry.data[CONF_PORT]
         self._attr_name = f"Remote connection to {host}:{port}"
         self._attr_unique_id = config_entry.unique_id
         self._attr_should_poll = False
-        self._attr_device_info = DeviceInfo(
-            name="Home Assistant",
-            configuration_url=f"{proto}://{host}:{port}",
-            identifiers={(DOMAIN, f"remote_{self._attr_unique_id}")},
-        )
+        self._attr_device_info = _device_info(config_entry)
 
     @property
     def state(self):
@@ -50,18 +186,58 @@ class ConnectionStatusSensor(Entity):
             "entity_prefix": self._entry.options.get(CONF_ENTITY_PREFIX, ""),
             "entity_friendly_name_prefix": self._entry.options.get(CONF_ENTITY_FRIENDLY_NAME_PREFIX, ""),
             "uuid": self.unique_id,
+            **self._progress,
         }
 
     async def async_added_to_hass(self):
         """Subscribe to events."""
         await super().async_added_to_hass()
 
-        def _update_handler(state):
+        def _update_handler(state, progress=None):
             """Update entity state when status was updated."""
             self._state = state
+            self._progress = progress or {}
             self.schedule_update_ha_state()
 
         signal = f"remote_homeassistant_{self._entry.unique_id}"
         self.async_on_remove(
             async_dispatcher_connect(self.hass, signal, _update_handler)
         )
+
+
+class RemoteMetricSensor(SensorEntity):
+    """Diagnostic sensor exposing a performance metric of a remote connection.
+
+    Disabled by default to not add recorder writes, all metrics are included
+    in the diagnostics of the config entry.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, config_entry, remote, key):
+        """Initialize the metric sensor."""
+        name, unit, state_class, value_fn, attributes_fn = METRIC_SENSORS[key]
+        self._remote = remote
+        self._value_fn = value_fn
+        self._attributes_fn = attributes_fn
+
+        host = config_entry.data[CONF_HOST]
+        port = config_entry.data[CONF_PORT]
+        self._attr_name = f"Remote connection to {host}:{port} {name}"
+        self._attr_unique_id = f"{config_entry.unique_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_device_info = _device_info(config_entry)
+
+    @property
+    def native_value(self):
+        """Return current value of metric."""
+        return self._value_fn(self._remote)
+
+    @property
+    def extra_state_attributes(self):
+        """Return additional details of metric."""
+        if self._attributes_fn is None:
+            return None
+        return self._attributes_fn(self._remote)
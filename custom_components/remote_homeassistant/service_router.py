@@ -0,0 +1,96 @@
+"""Routing of local service calls to remote instances."""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import CONF_SERVICE_ROUTER, DOMAIN
+
+if TYPE_CHECKING:
+    from . import RemoteConnection
+
+
+class ServiceCallRouter:
+    """Forward local service calls to the remote instances owning the entities.
+
+    A single call_service listener is shared by all connections. It maps
+    entity ids to connections using an index maintained by the connections
+    as they publish and remove entities.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize a new ServiceCallRouter."""
+        self._hass = hass
+        # Lowercase local entity id -> (remote entity id, owning connection)
+        self._index: dict[str, tuple[str, RemoteConnection]] = {}
+        self._connections: set[RemoteConnection] = set()
+        self._remove_listener: Callable[[], None] | None = None
+
+    @callback
+    def async_register(self, connection: RemoteConnection) -> Callable[[], None]:
+        """Register a connection, returns function to unregister it again."""
+        self._connections.add(connection)
+        if self._remove_listener is None:
+            self._remove_listener = self._hass.bus.async_listen(
+                EVENT_CALL_SERVICE, self._async_handle_call_service
+            )
+
+        @callback
+        def _async_unregister():
+            self._connections.discard(connection)
+            if not self._connections and self._remove_listener is not None:
+                self._remove_listener()
+                self._remove_listener = None
+
+        return _async_unregister
+
+    @callback
+    def async_add_entity(
+        self, entity_id: str, remote_entity_id: str, connection: RemoteConnection
+    ) -> None:
+        """Add a published entity to the index."""
+        self._index[entity_id.lower()] = (remote_entity_id, connection)
+
+    @callback
+    def async_remove_entity(self, entity_id: str) -> None:
+        """Remove a published entity from the index."""
+        self._index.pop(entity_id.lower(), None)
+
+    @callback
+    def _async_handle_call_service(self, event: Event) -> None:
+        """Forward service call to connections owning the targeted entities."""
+        if not self._index:
+            return
+
+        service_data = event.data["service_data"]
+        if not service_data:
+            return
+
+        entity_ids = service_data.get("entity_id", None)
+        if not entity_ids:
+            return
+
+        if isinstance(entity_ids, str):
+            entity_ids = (entity_ids,)
+
+        targets: dict[RemoteConnection, dict[str, None]] = {}
+        for entity_id in map(str.lower, entity_ids):
+            target = self._index.get(entity_id)
+            if target is not None:
+                remote_entity_id, connection = target
+                targets.setdefault(connection, {})[remote_entity_id] = None
+
+        for connection, remote_entity_ids in targets.items():
+            self._hass.async_create_task(
+                connection.async_forward_service_call(event, list(remote_entity_ids))
+            )
+
+
+@callback
+def async_get_router(hass: HomeAssistant) -> ServiceCallRouter:
+    """Return the service call router shared by all connections."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if CONF_SERVICE_ROUTER not in data:
+        data[CONF_SERVICE_ROUTER] = ServiceCallRouter(hass)
+    return data[CONF_SERVICE_ROUTER]
@@ -0,0 +1,143 @@
+"""Rewriting of remote entity ids and attributes for the local instance."""
+from __future__ import annotations
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant, split_entity_id
+try:
+    from homeassistant.core_config import DATA_CUSTOMIZE
+except (ModuleNotFoundError, ImportError):
+    # hass 2024.10 or older
+    from homeassistant.config import DATA_CUSTOMIZE
+
+ATTR_FRIENDLY_NAME = "friendly_name"
+ATTR_ENTITY_PICTURE = "entity_picture"
+
+# Marker for customization not looked up yet
+_UNSET = object()
+
+_ABSOLUTE_URL = re.compile(r"^https?://")
+
+
+class EntityRewritePlan:
+    """How states of a remote entity are rewritten."""
+
+    __slots__ = (
+        "entity_id",
+        "unique_id",
+        "customize",
+        "raw_friendly_name",
+        "friendly_name",
+        "raw_entity_picture",
+        "entity_picture",
+    )
+
+    def __init__(self, entity_id: str, unique_id: str):
+        """Initialize a new EntityRewritePlan."""
+        self.entity_id = entity_id
+        self.unique_id = unique_id
+        self.customize: Any = _UNSET
+        self.raw_friendly_name: str | None = None
+        self.friendly_name: str | None = None
+        self.raw_entity_picture: str | None = None
+        self.entity_picture: str | None = None
+
+
+class StateRewriter:
+    """Rewrite remote states using cached per-entity plans.
+
+    Local entity id and unique id of an entity are computed once. Rewritten
+    friendly_name and entity_picture are kept along with the value they were
+    computed from and only recomputed when that value changes. Customizations
+    are looked up once per entity and dropped when customize is reloaded,
+    which replaces DATA_CUSTOMIZE.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        unique_id_prefix: str,
+        entity_prefix: str,
+        friendly_name_prefix: str,
+        base_url: str,
+    ):
+        """Initialize a new StateRewriter."""
+        self._hass = hass
+        self._unique_id_prefix = unique_id_prefix
+        self._entity_prefix = entity_prefix
+        self._friendly_name_prefix = friendly_name_prefix
+        self._base_url = base_url
+        self._customize = hass.data.get(DATA_CUSTOMIZE)
+        self._plans: dict[str, EntityRewritePlan] = {}
+
+    def entity_id(self, remote_entity_id: str) -> str:
+        """Return local entity id of a remote entity."""
+        return self.plan(remote_entity_id).entity_id
+
+    def plan(self, remote_entity_id: str) -> EntityRewritePlan:
+        """Return (cached) rewrite plan of a remote entity."""
+        try:
+            return self._plans[remote_entity_id]
+        except KeyError:
+            pass
+
+        entity_id = remote_entity_id
+        if self._entity_prefix:
+            domain, object_id = split_entity_id(entity_id)
+            entity_id = f"{domain}.{self._entity_prefix}{object_id}"
+        plan = self._plans[remote_entity_id] = EntityRewritePlan(
+            entity_id, f"{self._unique_id_prefix}_{entity_id}"
+        )
+        return plan
+
+    def remove(self, remote_entity_id: str) -> None:
+        """Forget plan of an entity removed on the remote instance."""
+        self._plans.pop(remote_entity_id, None)
+
+    def rewrite(self, remote_entity_id: str, attr: dict) -> EntityRewritePlan:
+        """Rewrite attributes of a remote state in place, returns plan used."""
+        customize = self._hass.data.get(DATA_CUSTOMIZE)
+        if customize is not self._customize:
+            self._customize = customize
+            for plan in self._plans.values():
+                plan.customize = _UNSET
+
+        plan = self.plan(remote_entity_id)
+        attr["unique_id"] = plan.unique_id
+
+        if plan.customize is _UNSET:
+            plan.customize = (
+                customize.get(plan.entity_id) if customize is not None else None
+            )
+        if plan.customize:
+            attr.update(plan.customize)
+
+        friendly_name = attr.get(ATTR_FRIENDLY_NAME)
+        if friendly_name is not None:
+            if friendly_name != plan.raw_friendly_name:
+                plan.raw_friendly_name = friendly_name
+                plan.friendly_name = self._prefixed_friendly_name(friendly_name)
+            attr[ATTR_FRIENDLY_NAME] = plan.friendly_name
+
+        entity_picture = attr.get(ATTR_ENTITY_PICTURE)
+        if entity_picture is not None:
+            if entity_picture != plan.raw_entity_picture:
+                plan.raw_entity_picture = entity_picture
+                plan.entity_picture = self._full_picture_url(entity_picture)
+            attr[ATTR_ENTITY_PICTURE] = plan.entity_picture
+
+        return plan
+
+    def _prefixed_friendly_name(self, friendly_name: str) -> str:
+        """Return friendly name with prefix, unless it already has it."""
+        if self._friendly_name_prefix and not friendly_name.startswith(
+            self._friendly_name_prefix
+        ):
+            return self._friendly_name_prefix + friendly_name
+        return friendly_name
+
+    def _full_picture_url(self, url: str) -> str:
+        """Return absolute URL of a picture served by the remote instance."""
+        if _ABSOLUTE_URL.match(url) or url.startswith(self._base_url):
+            return url
+        return self._base_url + url
@@ -0,0 +1,97 @@
+"""Coalescing of frequent state updates from remote entities."""
+from __future__ import annotations
+from typing import Any, Callable
+
+
+class StateThrottle:
+    """Rate limit state updates per entity.
+
+    Updates arriving within min_interval of the last published update are
+    held back and only the latest one is published when the interval has
+    passed. Numeric states changing less than deadband compared to the last
+    published value are dropped.
+    """
+
+    def __init__(self, hass):
+        """Initialize a new StateThrottle."""
+        self._hass = hass
+        self._last_published: dict[str, tuple[float, float | None]] = {}
+        self._pending: dict[str, tuple[str, dict, Callable]] = {}
+        self._timers: dict[str, Any] = {}
+
+    def async_update(
+        self,
+        entity_id: str,
+        state: str,
+        attr: dict,
+        min_interval: float | None,
+        deadband: float | None,
+        publish: Callable[[str, str, dict], None],
+    ) -> bool:
+        """Handle a state update, return True if it should not be published now."""
+        now = self._hass.loop.time()
+        last_time, last_value = self._last_published.get(entity_id, (None, None))
+
+        try:
+            value = float(state)
+        except ValueError:
+            value = None
+
+        if (
+            deadband
+            and value is not None
+            and last_value is not None
+            and abs(value - last_value) <= deadband
+        ):
+            # A held back update is superseded by this one, which is not
+            # different enough to be published
+            self._cancel(entity_id)
+            return True
+
+        if min_interval and last_time is not None and now - last_time < min_interval:
+            self._pending[entity_id] = (state, attr, publish)
+            if entity_id not in self._timers:
+                self._timers[entity_id] = self._hass.loop.call_at(
+                    last_time + min_interval, self._async_publish, entity_id
+                )
+            return True
+
+        self._cancel(entity_id)
+        self._last_published[entity_id] = (now, value)
+        return False
+
+    def _cancel(self, entity_id: str) -> None:
+        """Drop held back update for an entity."""
+        self._pending.pop(entity_id, None)
+        timer = self._timers.pop(entity_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _async_publish(self, entity_id: str) -> None:
+        """Publish held back update for an entity."""
+        self._timers.pop(entity_id, None)
+        pending = self._pending.pop(entity_id, None)
+        if pending is None:
+            return
+
+        state, attr, publish = pending
+        try:
+            value = float(state)
+        except ValueError:
+            value = None
+        self._last_published[entity_id] = (self._hass.loop.time(), value)
+        publish(entity_id, state, attr)
+
+    def async_remove(self, entity_id: str) -> None:
+        """Forget about an entity removed on the remote instance."""
+        self._cancel(entity_id)
+        self._last_published.pop(entity_id, None)
+
+    def async_flush(self) -> None:
+        """Publish all held back updates immediately."""
+        for entity_id in list(self._pending):
+            timer = self._timers.pop(entity_id, None)
+            if timer is not None:
+                timer.cancel()
+            self._async_publish(entity_id)
+        self._last_published = {}